@@ -15,3 +15,61 @@ if _env_path.is_file():
 RENTCAST_API_KEY = os.environ.get("RENTCAST_API_KEY", "")
 NEWSCATCHER_API_KEY = os.environ.get("NEWSCATCHER_API_KEY", "")
 UNSPLASH_ACCESS_KEY = os.environ.get("UNSPLASH_ACCESS_KEY", "")
+UNSPLASH_HOURLY_LIMIT = int(os.environ.get("UNSPLASH_HOURLY_LIMIT", "50"))  # demo apps: 50 requests/hour
+
+# Upstream base URLs; override to use mirrors or local stand-ins (see benchmarks/bench_cold_start.py)
+CENSUS_GEOCODER_URL = os.environ.get("CENSUS_GEOCODER_URL") or "https://geocoding.geo.census.gov/geocoder"
+NCES_SCHOOLS_URL = os.environ.get("NCES_SCHOOLS_URL") or (
+    "https://nces.ed.gov/opengis/rest/services/K12_School_Locations/EDGE_GEOCODE_PUBLICSCH_1920/MapServer/0"
+)
+RENTCAST_BASE_URL = os.environ.get("RENTCAST_BASE_URL") or "https://api.rentcast.io/v1"
+NEWSCATCHER_LOCAL_URL = os.environ.get("NEWSCATCHER_LOCAL_URL") or "https://local-news.newscatcherapi.com/api/search"
+NEWSCATCHER_URL = os.environ.get("NEWSCATCHER_URL") or "https://v3-api.newscatcherapi.com/api/search"
+
+# Startup: pre-resolve and pre-connect upstream hosts in the background; /ready reports when done
+PREWARM_UPSTREAMS = os.environ.get("PREWARM_UPSTREAMS", "1").strip() not in ("0", "false", "no")
+
+# Local state (hot keys, caches on disk); defaults to <project root>/.data
+DATA_DIR = Path(os.environ.get("DATA_DIR") or Path(__file__).resolve().parent.parent / ".data")
+
+# Address autocomplete: optional bulk file of canonical addresses (one per line) loaded at startup
+ADDRESS_INDEX_FILE = os.environ.get("ADDRESS_INDEX_FILE", "").strip()
+
+# Cache warm-up: pre-fetch the most requested addresses/areas at startup and keep them fresh
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "1").strip() not in ("0", "false", "no")
+WARMUP_TOP_K = int(os.environ.get("WARMUP_TOP_K", "50"))
+
+# Tracing: head-sample a fraction of requests, always keep slow ones (tail sampler).
+# Export goes to TRACE_OTLP_ENDPOINT (OTLP/HTTP JSON, e.g. http://localhost:4318/v1/traces) if set, else a local JSONL file.
+TRACE_SAMPLE_RATE = float(os.environ.get("TRACE_SAMPLE_RATE", "0.01"))
+TRACE_SLOW_MS = float(os.environ.get("TRACE_SLOW_MS", "5000"))
+TRACE_EXPORT_PATH = os.environ.get("TRACE_EXPORT_PATH") or str(DATA_DIR / "traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.environ.get("TRACE_OTLP_ENDPOINT", "").strip()
+
+# Asynchronous jobs (POST /api/jobs): SQLite-backed queue drained by a bounded worker pool
+JOBS_DB_PATH = os.environ.get("JOBS_DB_PATH") or str(DATA_DIR / "jobs.sqlite3")
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_MIN_INTERVAL = float(os.environ.get("JOB_MIN_INTERVAL", "0.5"))  # seconds between item starts
+
+# Overpass mirrors (comma-separated), e.g. a self-hosted instance first; queries are hedged across them
+OVERPASS_URLS = [
+    u.strip()
+    for u in os.environ.get(
+        "OVERPASS_URLS",
+        "https://overpass-api.de/api/interpreter,"
+        "https://overpass.kumi.systems/api/interpreter,"
+        "https://overpass.private.coffee/api/interpreter",
+    ).split(",")
+    if u.strip()
+]
+
+# Admission control: separate concurrency caps and queue-wait budgets (seconds) per priority class.
+# Requests are batch when sent with "X-Priority: batch" or an API key listed in BATCH_API_KEYS.
+INTERACTIVE_CONCURRENCY = int(os.environ.get("INTERACTIVE_CONCURRENCY", "32"))
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "4"))
+INTERACTIVE_QUEUE_BUDGET = float(os.environ.get("INTERACTIVE_QUEUE_BUDGET", "10"))
+BATCH_QUEUE_BUDGET = float(os.environ.get("BATCH_QUEUE_BUDGET", "120"))
+BATCH_API_KEYS = {k.strip() for k in os.environ.get("BATCH_API_KEYS", "").split(",") if k.strip()}
+
+# Profile snapshots (python -m app.services.snapshots build FILE): build concurrency
+SNAPSHOT_CONCURRENCY = int(os.environ.get("SNAPSHOT_CONCURRENCY", "4"))
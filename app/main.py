@@ -1,13 +1,51 @@
 """FastAPI app: property profile API."""
-from fastapi import FastAPI
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.config import BATCH_API_KEYS, WARMUP_ENABLED
+from app.routers import images as images_router
+from app.routers import jobs as jobs_router
 from app.routers import property as property_router
+from app.services import http, jobs, scheduler, startup, tracing
+from app.services.address_index import index as address_index
+from app.services.hot_keys import tracker as hot_keys
+from app.services.warmup import run_persistence, run_warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start job workers, background pre-connect/preload (see /ready), cache warm-up and periodic
+    persistence of hot keys and new addresses (also saved on shutdown). Nothing slow is awaited here, so the server accepts
+    requests as soon as the app is imported.
+    """
+    hot_keys.load()
+    await jobs.start_workers()
+    startup_task = asyncio.create_task(startup.run())
+    warmup_task = asyncio.create_task(run_warmup()) if WARMUP_ENABLED else None
+    persist_task = asyncio.create_task(run_persistence())
+    yield
+    await jobs.stop_workers()
+    for task in (warmup_task, persist_task, startup_task):
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+    hot_keys.save()
+    address_index.save()
+    await http.aclose()
+
 
 app = FastAPI(
     title="Property Profile API",
     description="Unified property data: geocode, schools, property info.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -19,9 +57,67 @@ app.add_middleware(
 )
 
 app.include_router(property_router.router)
+app.include_router(images_router.router)
+app.include_router(jobs_router.router)
+
+
+@app.exception_handler(scheduler.Overloaded)
+async def overloaded_handler(request: Request, exc: scheduler.Overloaded):
+    """Load shedding: queue wait would exceed the latency budget."""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Server busy; retry later.", "priority": exc.priority},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.middleware("http")
+async def classify_priority(request: Request, call_next):
+    """Batch traffic is opted in by header or API key; everything else is interactive."""
+    api_key = request.headers.get("x-api-key", "")
+    if request.headers.get("x-priority", "").lower() == scheduler.BATCH or (api_key and api_key in BATCH_API_KEYS):
+        scheduler.set_priority(scheduler.BATCH)
+    else:
+        scheduler.set_priority(scheduler.INTERACTIVE)
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Root span per /api request; export decided by head sampling, slowness or 5xx."""
+    if not request.url.path.startswith("/api/"):
+        return await call_next(request)
+    debug = request.query_params.get("debug_trace", "").lower() in ("1", "true")
+    trace = None
+    try:
+        with tracing.start_trace(
+            f"{request.method} {request.url.path}",
+            force_sample=debug,
+            **{"http.method": request.method, "http.target": request.url.path},
+        ) as trace:
+            response = await call_next(request)
+            trace.spans[0].attributes["http.status_code"] = response.status_code
+    except Exception:
+        # Unhandled errors leave the block before a response exists; the root span has recorded the error
+        if trace is not None:
+            trace.spans[0].attributes["http.status_code"] = 500
+            tracing.finish_trace(trace, error=True)
+        raise
+    tracing.finish_trace(trace, error=response.status_code >= 500)
+    response.headers["X-Trace-Id"] = trace.trace_id
+    return response
 
 
 @app.get("/health")
 def health():
     """Health check; no external API calls."""
     return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready():
+    """Readiness: 503 until upstreams are pre-connected and heavy modules/indexes are loaded."""
+    state = startup.readiness()
+    if not state["ready"]:
+        return JSONResponse(status_code=503, content={"status": "starting", **state})
+    return {"status": "ready", **state}
@@ -0,0 +1,27 @@
+"""Locally stored placeholder images, resized and re-encoded on demand."""
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from app.services import image_store
+
+router = APIRouter(prefix="/api", tags=["images"])
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"  # image ids never change content
+
+
+@router.get("/images/{image_id}")
+async def get_image(
+    image_id: str,
+    w: int = Query(640, ge=1, le=4000),
+    fmt: str = Query("webp", pattern="^(webp|jpeg)$"),
+):
+    """Placeholder image variant (width snapped to 320/640/960/1280). 404 if the image is not stored."""
+    if not image_store.has_image(image_id):
+        raise HTTPException(status_code=404, detail="Image not found.")
+    variant = await asyncio.to_thread(image_store.get_variant, image_id, image_store.snap_width(w), fmt)
+    if variant is None:
+        raise HTTPException(status_code=404, detail="Image not found.")
+    path, media_type = variant
+    return FileResponse(path, media_type=media_type, headers={"Cache-Control": CACHE_CONTROL})
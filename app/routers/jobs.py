@@ -0,0 +1,36 @@
+"""Asynchronous job endpoints: submit profile requests, poll status and paged results."""
+import json
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.schemas.jobs import JobStatusResponse, JobSubmitRequest, JobSubmitResponse
+from app.services.jobs import get_job, submit_job
+
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+
+@router.post("/jobs", response_model=JobSubmitResponse, status_code=202)
+async def post_job(body: JobSubmitRequest):
+    """Queue one or more profile requests; returns a job id to poll."""
+    items = [
+        (r.address, r.radius_km if r.radius_km is not None else 2.0)
+        for r in body.requests
+    ]
+    job_id = await submit_job(items)
+    return JobSubmitResponse(job_id=job_id, status="queued", total=len(items))
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Job status and a page of items (results included for finished items)."""
+    job = await get_job(job_id, offset=offset, limit=limit)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    for item in job["items"]:
+        if item["result"] is not None:
+            item["result"] = json.loads(item["result"])
+    return job
@@ -1,47 +1,165 @@
 """Property profile and granular (geocode, schools, property) endpoints."""
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+import gzip
+import json
+from dataclasses import asdict
+from typing import Optional
 
-from app.schemas.profile import PropertyProfileRequest, PropertyProfileResponse
-from app.services.aggregator import build_property_profile
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
+
+from app.schemas.address import AddressSuggestResponse
+from app.schemas.profile import (
+    NearbyResponse,
+    PropertyComparisonRequest,
+    PropertyComparisonResponse,
+    PropertyProfileRequest,
+    PropertyProfileResponse,
+)
+from app.services import snapshots, tracing
+from app.services.address_index import index as address_index
+from app.services.aggregator import build_nearby_section, build_property_comparison, build_property_profile
 from app.services.geocode import geocode_address_with_geographies
 from app.services.schools import get_schools_near_point
 from app.services.rentcast import get_property_by_address
+from app.services.scheduler import admission
 
 router = APIRouter(prefix="/api", tags=["property"])
 
 
+def _profile_response(profile: PropertyProfileResponse, debug_trace: bool) -> Response:
+    """Serialize inside a span; with debug_trace, append the request's span tree as `trace`."""
+    with tracing.span("serialize"):
+        content = profile.model_dump_json()
+    if not debug_trace:
+        return Response(content=content, media_type="application/json")
+    body = json.loads(content)
+    trace = tracing.current_trace()
+    body["trace"] = tracing.span_tree(trace) if trace else None
+    return JSONResponse(body)
+
+
+def _read_snapshot(address: str, radius_km: float, accept_gzip: bool) -> Optional[tuple[dict, bytes]]:
+    """Index lookup, file read and (if needed) decompression; blocking, so run in a thread."""
+    snap = snapshots.lookup(address, radius_km)
+    if snap is None:
+        return None
+    try:
+        body = snap["path"].read_bytes()
+    except OSError:
+        return None  # replaced or removed since the lookup: build live instead
+    return snap, body if accept_gzip else gzip.decompress(body)
+
+
+async def _snapshot_response(request: Request, address: str, radius_km: float) -> Optional[Response]:
+    """Serve a prebuilt snapshot as-is (gzip bytes when the client accepts them)."""
+    if radius_km != snapshots.SNAPSHOT_RADIUS_KM:
+        return None  # snapshots are only built for the default radius; skip the thread hop
+    accept_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    with tracing.span("snapshot") as s:
+        found = await asyncio.to_thread(_read_snapshot, address, radius_km, accept_gzip)
+        if s is not None:
+            s.attributes["hit"] = found is not None
+            if found is not None:
+                s.attributes["version"] = found[0]["version"]
+    if found is None:
+        return None
+    snap, body = found
+    headers = {
+        "X-Snapshot-Version": str(snap["version"]),
+        "X-Snapshot-Age": str(snap["age"]),
+        "ETag": f'"{snap["hash"]}"',
+        "Vary": "Accept-Encoding",
+    }
+    if accept_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/property-profile", response_model=PropertyProfileResponse)
 async def get_property_profile(
+    request: Request,
     address: str = Query(..., min_length=1),
     radius_km: float = Query(2.0, ge=0.5, le=10.0),
+    debug_trace: bool = Query(False, description="Include the request's span tree as `trace`."),
 ):
-    """Unified property profile: location, map data, schools, property, nearby POI."""
+    """Unified property profile: location, map data, schools, property, nearby POI.
+    Served from a prebuilt snapshot (headers X-Snapshot-Version / X-Snapshot-Age) when one exists."""
+    if not debug_trace:
+        cached = await _snapshot_response(request, address, radius_km)
+        if cached is not None:
+            return cached
     profile = await build_property_profile(address, radius_km=radius_km)
     if profile is None:
         raise HTTPException(
             status_code=404,
             detail="Address could not be geocoded. Check the address and try again.",
         )
-    return profile
+    return _profile_response(profile, debug_trace)
 
 
 @router.post("/property-profile", response_model=PropertyProfileResponse)
-async def post_property_profile(body: PropertyProfileRequest):
+async def post_property_profile(
+    request: Request,
+    body: PropertyProfileRequest,
+    debug_trace: bool = Query(False, description="Include the request's span tree as `trace`."),
+):
     """Unified property profile (POST with body)."""
     radius = body.radius_km if body.radius_km is not None else 2.0
+    if not debug_trace:
+        cached = await _snapshot_response(request, body.address, radius)
+        if cached is not None:
+            return cached
     profile = await build_property_profile(body.address, radius_km=radius)
     if profile is None:
         raise HTTPException(
             status_code=404,
             detail="Address could not be geocoded. Check the address and try again.",
         )
-    return profile
+    return _profile_response(profile, debug_trace)
+
+
+@router.post("/property-profile/compare", response_model=PropertyComparisonResponse)
+async def compare_property_profiles(body: PropertyComparisonRequest):
+    """Profiles for 2–10 addresses built together, with side-by-side summaries."""
+    radius = body.radius_km if body.radius_km is not None else 2.0
+    comparison = await build_property_comparison(body.addresses, radius_km=radius)
+    if not comparison.profiles:
+        raise HTTPException(
+            status_code=404,
+            detail="None of the addresses could be geocoded.",
+        )
+    return comparison
+
+
+@router.get("/nearby", response_model=NearbyResponse)
+async def get_nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(2.0, ge=0.5, le=10.0),
+):
+    """Nearby places and neighbourhood stats only, e.g. when the user changes radius_km."""
+    return await build_nearby_section(lat, lon, radius_km)
+
+
+@router.get("/address-suggest", response_model=AddressSuggestResponse)
+async def address_suggest(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=25),
+):
+    """Autocomplete from addresses already geocoded (and the optional bulk file), most requested first."""
+    suggestions = address_index.suggest(q, limit)
+    return AddressSuggestResponse(
+        query=q,
+        suggestions=[{"address": a, "popularity": p} for a, p in suggestions],
+    )
 
 
 @router.get("/geocode")
 async def get_geocode(address: str = Query(..., min_length=1)):
     """Census geocode only: lat, lon, matched address, optional geographies."""
-    result = await geocode_address_with_geographies(address)
+    async with admission():
+        result = await geocode_address_with_geographies(address)
     if result is None:
         raise HTTPException(status_code=404, detail="Address could not be geocoded.")
     return result
@@ -54,14 +172,16 @@ async def get_schools(
     radius_km: float = Query(5.0, ge=0.1, le=50.0),
 ):
     """NCES schools near a point (lat, lon)."""
-    schools = await get_schools_near_point(lon, lat, radius_km=radius_km)
-    return {"schools": schools}
+    async with admission():
+        schools = await get_schools_near_point(lon, lat, radius_km=radius_km)
+    return {"schools": [asdict(s) for s in schools]}
 
 
 @router.get("/property")
 async def get_property(address: str = Query(..., min_length=1)):
     """RentCast property by address. 404 if no data."""
-    prop = await get_property_by_address(address)
+    async with admission():
+        prop = await get_property_by_address(address)
     if prop is None:
         raise HTTPException(
             status_code=404,
@@ -4,7 +4,22 @@ from app.schemas.profile import (
     MapData,
     MapSchool,
     School,
+    RingStats,
+    NeighborhoodStats,
+    Demographics,
+    AssignedDistrict,
     PropertyProfileRequest,
+    PropertyComparisonRequest,
+    ComparisonSummary,
+    PropertyComparisonResponse,
+    NearbyResponse,
+)
+from app.schemas.address import AddressSuggestion, AddressSuggestResponse
+from app.schemas.jobs import (
+    JobSubmitRequest,
+    JobSubmitResponse,
+    JobItem,
+    JobStatusResponse,
 )
 
 __all__ = [
@@ -13,5 +28,19 @@ __all__ = [
     "MapData",
     "MapSchool",
     "School",
+    "RingStats",
+    "NeighborhoodStats",
+    "Demographics",
+    "AssignedDistrict",
     "PropertyProfileRequest",
+    "PropertyComparisonRequest",
+    "ComparisonSummary",
+    "PropertyComparisonResponse",
+    "NearbyResponse",
+    "AddressSuggestion",
+    "AddressSuggestResponse",
+    "JobSubmitRequest",
+    "JobSubmitResponse",
+    "JobItem",
+    "JobStatusResponse",
 ]
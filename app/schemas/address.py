@@ -0,0 +1,14 @@
+"""Pydantic models for address autocomplete."""
+from pydantic import BaseModel, Field
+
+
+class AddressSuggestion(BaseModel):
+    """A canonical address already known to the geocoder."""
+    address: str
+    popularity: int = Field(0, description="Estimated number of profile requests for this address")
+
+
+class AddressSuggestResponse(BaseModel):
+    """Returned by GET /api/address-suggest."""
+    query: str
+    suggestions: list[AddressSuggestion] = Field(default_factory=list)
@@ -0,0 +1,46 @@
+"""Pydantic models for the asynchronous job API."""
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.profile import PropertyProfileRequest, PropertyProfileResponse
+
+MAX_JOB_ITEMS = 500
+
+
+class JobSubmitRequest(BaseModel):
+    """Request body for POST /api/jobs: one or more profile requests."""
+    requests: list[PropertyProfileRequest] = Field(..., min_length=1, max_length=MAX_JOB_ITEMS)
+
+
+class JobSubmitResponse(BaseModel):
+    """Returned by POST /api/jobs."""
+    job_id: str
+    status: str
+    total: int
+
+
+class JobItem(BaseModel):
+    """One profile request within a job, with its result once finished."""
+    index: int
+    address: str
+    radius_km: float
+    status: str = Field(..., description="queued | running | done | failed")
+    result: Optional[PropertyProfileResponse] = None
+    error: Optional[str] = None
+
+
+class JobStatusResponse(BaseModel):
+    """Returned by GET /api/jobs/{job_id}; items are paged with offset/limit."""
+    job_id: str
+    status: str = Field(..., description="queued | running | completed")
+    created_at: float
+    updated_at: float
+    total: int
+    queued: int
+    running: int
+    done: int
+    failed: int
+    offset: int
+    limit: int
+    items: list[JobItem] = Field(default_factory=list)
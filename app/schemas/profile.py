@@ -1,7 +1,7 @@
 """Pydantic models for property profile API."""
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Location(BaseModel):
@@ -14,6 +14,7 @@ class Location(BaseModel):
 
 class MapSchool(BaseModel):
     """School point for map pins."""
+    model_config = ConfigDict(from_attributes=True)  # built directly from SchoolRecord
     name: str
     lat: float
     lon: float
@@ -31,6 +32,7 @@ class MapData(BaseModel):
 
 class School(BaseModel):
     """School for list view (can extend MapSchool)."""
+    model_config = ConfigDict(from_attributes=True)  # built directly from SchoolRecord
     name: str
     nces_id: Optional[str] = None
     street: Optional[str] = None
@@ -39,10 +41,12 @@ class School(BaseModel):
     zip: Optional[str] = None
     lat: Optional[float] = None
     lon: Optional[float] = None
+    lea_id: Optional[str] = Field(None, description="NCES school district (LEA) ID")
 
 
 class NearbyPlace(BaseModel):
     """POI from Overpass (food, gym, grocery, mall, etc.)."""
+    model_config = ConfigDict(from_attributes=True)  # built directly from PlaceRecord
     name: str
     lat: float
     lon: float
@@ -58,6 +62,52 @@ class NewsItem(BaseModel):
     published_date: Optional[str] = None
 
 
+class RingStats(BaseModel):
+    """Amenity counts within one distance ring around the home."""
+    radius_km: float
+    counts: Optional[dict[str, int]] = Field(
+        None, description="POI category -> count; null when the ring exceeds the POI search radius"
+    )
+    schools: int = 0
+
+
+class NeighborhoodStats(BaseModel):
+    """Ring counts, nearest distances and a composite 0-100 amenity score (computed per ~150 m geohash cell)."""
+    geohash: str
+    poi_radius_km: float
+    rings: list[RingStats] = Field(default_factory=list)
+    nearest_km: dict[str, float] = Field(default_factory=dict, description="category (or 'school') -> km")
+    amenity_score: float
+    complete: bool = Field(True, description="False when the POI query hit its cap, so counts are a lower bound")
+
+
+class Demographics(BaseModel):
+    """ACS 5-year estimates for the address's block group (or tract), from the local store."""
+    geoid: str
+    level: str = Field(..., description="block_group | tract")
+    vintage: Optional[str] = None
+    population: Optional[int] = None
+    median_age: Optional[float] = None
+    median_household_income: Optional[int] = None
+    median_home_value: Optional[int] = None
+    median_gross_rent: Optional[int] = None
+    owner_occupied_units: Optional[int] = None
+    renter_occupied_units: Optional[int] = None
+
+
+class AssignedDistrict(BaseModel):
+    """NCES school district (LEA) whose boundary contains the address, from the local district store."""
+    lea_id: str
+    name: str
+    state_fips: Optional[str] = None
+    grades: Optional[str] = Field(None, description="Lowest-highest grade served, e.g. PK-12")
+    school_count: int = 0
+    schools: list[School] = Field(default_factory=list)
+    schools_source: str = Field(
+        ..., description="district (every school of the LEA) | nearby (only the profile's nearby schools)"
+    )
+
+
 class PropertyProfileRequest(BaseModel):
     """Request body for POST /api/property-profile."""
     address: str
@@ -76,3 +126,43 @@ class PropertyProfileResponse(BaseModel):
     nearby_places: list[NearbyPlace] = Field(default_factory=list)
     radius_km: Optional[float] = None
     local_news: Optional[list[NewsItem]] = None
+    neighborhood_stats: Optional[NeighborhoodStats] = None
+    demographics: Optional[Demographics] = None
+    assigned_district: Optional[AssignedDistrict] = None
+    nearby_places_truncated: bool = Field(False, description="More places exist within radius_km than are listed")
+
+
+class PropertyComparisonRequest(BaseModel):
+    """Request body for POST /api/property-profile/compare."""
+    addresses: list[str] = Field(..., min_length=2, max_length=10)
+    radius_km: Optional[float] = Field(None, ge=0.5, le=10.0)
+
+
+class ComparisonSummary(BaseModel):
+    """Side-by-side counts and nearest distances for one compared address."""
+    address: str
+    normalized_address: str
+    school_count: int
+    nearest_school_km: Optional[float] = None
+    place_count: int
+    places_by_category: dict[str, int] = Field(default_factory=dict)
+    nearest_place_km: dict[str, float] = Field(default_factory=dict, description="category -> km")
+    has_property_data: bool = False
+
+
+class PropertyComparisonResponse(BaseModel):
+    """Response for POST /api/property-profile/compare; profiles and summaries follow request order."""
+    radius_km: float
+    profiles: list[PropertyProfileResponse] = Field(default_factory=list)
+    summaries: list[ComparisonSummary] = Field(default_factory=list)
+    not_found: list[str] = Field(default_factory=list, description="Addresses that could not be geocoded")
+
+
+class NearbyResponse(BaseModel):
+    """Returned by GET /api/nearby: the radius-dependent sections of a profile for a point."""
+    lat: float
+    lon: float
+    radius_km: float
+    nearby_places: list[NearbyPlace] = Field(default_factory=list)
+    nearby_places_truncated: bool = False
+    neighborhood_stats: Optional[NeighborhoodStats] = None
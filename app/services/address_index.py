@@ -0,0 +1,146 @@
+"""Address autocomplete: sorted-array prefix index over canonical (already geocoded) addresses."""
+import bisect
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+from app.config import ADDRESS_INDEX_FILE, DATA_DIR
+from app.services.hot_keys import tracker as hot_keys
+
+logger = logging.getLogger(__name__)
+
+ADDRESS_INDEX_PATH = DATA_DIR / "addresses.txt"  # canonical addresses seen by the geocoder, one per line
+MAX_SCAN = 200  # prefix matches scanned per query (plus hot addresses); bounds per-keystroke work on short prefixes
+MIN_QUERY_LEN = 3
+_SEP = "\x1f"  # sorts before any printable character, so "<search key><SEP><address key>" keeps prefix order
+
+
+def search_key(text: str) -> str:
+    """Lowercase, drop commas, collapse whitespace: "123 Main St, City" -> "123 main st city"."""
+    return " ".join((text or "").lower().replace(",", " ").split())
+
+
+def _street_key(key: str) -> Optional[str]:
+    """Key without the house number, so "main st" also finds "123 main st ..."."""
+    number, _, rest = key.partition(" ")
+    return rest if rest and any(ch.isdigit() for ch in number) else None
+
+
+class AddressIndex:
+    """
+    Sorted list of "<search key>\\x1f<address key>" entries; a prefix lookup is one bisect plus a
+    scan of at most MAX_SCAN neighbours, merged with the matching hot-key top-k. Each address is indexed by its full key and by its key
+    without the house number. New addresses are appended to `path` on save(). The persisted
+    addresses are loaded by ensure_loaded() (the startup preload, in a worker thread), not at import;
+    until then suggest() returns nothing and add() defers its address, so requests never wait on the load.
+    """
+
+    def __init__(self, path: Optional[Path] = ADDRESS_INDEX_PATH):
+        self.path = path
+        self._entries: list[str] = []
+        self._addresses: dict[str, str] = {}  # address key -> canonical address as returned by the geocoder
+        self._pending: list[str] = []
+        self._deferred: list[str] = []  # add() calls made before the load finished
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def _entries_for(self, key: str) -> list[str]:
+        street = _street_key(key)
+        return [f"{key}{_SEP}{key}"] + ([f"{street}{_SEP}{key}"] if street else [])
+
+    def ensure_loaded(self) -> None:
+        """load() once; blocking, so call it off the event loop. Concurrent callers wait instead of loading twice."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self.load()
+                self._loaded = True
+
+    def _drain_deferred(self) -> None:
+        while self._deferred:
+            self.add(self._deferred.pop(0))
+
+    def add(self, address: str) -> None:
+        if not self._loaded:
+            self._deferred.append(address)
+            return
+        self._drain_deferred()
+        key = search_key(address)
+        if not key or key in self._addresses:
+            return
+        self._addresses[key] = address.strip()
+        for entry in self._entries_for(key):
+            bisect.insort(self._entries, entry)
+        self._pending.append(address.strip())
+
+    def add_many(self, addresses: Iterable[str]) -> int:
+        """Bulk insert (one sort instead of per-address inserts). Returns the number of new addresses."""
+        added = 0
+        for address in addresses:
+            key = search_key(address)
+            if not key or key in self._addresses:
+                continue
+            self._addresses[key] = address.strip()
+            self._entries.extend(self._entries_for(key))
+            added += 1
+        self._entries.sort()
+        return added
+
+    def suggest(self, query: str, limit: int = 10) -> list[tuple[str, int]]:
+        """Addresses whose full or street key starts with query, as (address, popularity), most popular first."""
+        prefix = search_key(query)
+        if len(prefix) < MIN_QUERY_LEN or not self._loaded:
+            return []
+        self._drain_deferred()
+        start = bisect.bisect_left(self._entries, prefix)
+        keys: dict[str, None] = {}
+        for entry in self._entries[start:start + MAX_SCAN]:
+            if not entry.startswith(prefix):
+                break
+            keys[entry.partition(_SEP)[2]] = None
+        # The scan only reaches the first MAX_SCAN matches in key order; popular addresses further
+        # along come from the hot-key top-k, so a short prefix still surfaces them
+        for hot, _ in hot_keys.top("address", hot_keys.top_k):
+            key = search_key(hot)
+            if key in self._addresses and (key.startswith(prefix) or (_street_key(key) or "").startswith(prefix)):
+                keys[key] = None
+        ranked = [(self._addresses[k], hot_keys.estimate("address", self._addresses[k])) for k in keys]
+        ranked.sort(key=lambda ap: (-ap[1], len(ap[0]), ap[0]))
+        return ranked[:limit]
+
+    def load(self) -> None:
+        """Load the persisted addresses and the optional bulk file (ADDRESS_INDEX_FILE)."""
+        for path in (self.path, Path(ADDRESS_INDEX_FILE) if ADDRESS_INDEX_FILE else None):
+            if path is None or not path.is_file():
+                continue
+            try:
+                with open(path) as f:
+                    n = self.add_many(line.strip() for line in f if line.strip() and not line.startswith("#"))
+            except OSError as e:
+                logger.warning("Could not load addresses from %s: %s", path, e)
+                continue
+            logger.info("Address index: %d addresses from %s", n, path)
+
+    def save(self) -> None:
+        """Append addresses added since the last save."""
+        if self.path is None or not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write("".join(f"{a}\n" for a in pending))
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            self._pending = pending + self._pending
+            logger.warning("Could not save addresses to %s: %s", self.path, e)
+
+
+index = AddressIndex()
@@ -1,24 +1,39 @@
 """Build unified property profile from geocode, schools, RentCast, and optional POI/news/images."""
 import asyncio
-from typing import Optional
+from collections import Counter
+from typing import Any, Optional
 
 from app.schemas.profile import (
     PropertyProfileResponse,
     Location,
     MapData,
     MapSchool,
-    School,
-    NearbyPlace,
+    NearbyResponse,
     NewsItem,
+    NeighborhoodStats,
+    Demographics,
+    AssignedDistrict,
+    ComparisonSummary,
+    PropertyComparisonResponse,
 )
 from app.services.geocode import geocode_address_with_geographies
-from app.services.schools import get_schools_near_point
+from app.services.schools import get_schools_near_point, get_schools_in_bbox
 from app.services.rentcast import get_property_by_address
-from app.services.nearby_poi import get_nearby_poi
+from app.services.nearby_poi import get_nearby_poi, get_pois_in_bbox, MAX_PLACES, MAX_AREA_PLACES
+from app.services import demographics, districts, neighborhood
 from app.services.local_news import get_local_news
 from app.services.placeholder_images import get_placeholder_image
+from app.services.records import PlaceRecord, SchoolRecord
+from app.services.address_index import search_key
+from app.services.hot_keys import tracker as hot_keys
+from app.services.scheduler import admission
+from app.services.tracing import span, traced
+from app.services.geo_utils import bbox_around, group_nearby, haversine_km, in_square
 from app.config import UNSPLASH_ACCESS_KEY
 
+SCHOOLS_RADIUS_KM = 5.0
+MAX_REGION_SPAN_KM = 15.0  # compare: addresses within this span share one schools/POI query
+
 
 def _city_state_from_address(matched_address: str) -> tuple[Optional[str], Optional[str]]:
     """Parse 'City, STATE' from Census matched_address (e.g. '..., Mountain View, CA, 94043')."""
@@ -32,6 +47,87 @@ def _city_state_from_address(matched_address: str) -> tuple[Optional[str], Optio
     return None, None
 
 
+def _record_hot_keys(address: str, matched_address: str, city: Optional[str], state: Optional[str]) -> None:
+    """Count the typed address (warm-up replays it) and its canonical form (autocomplete ranks by it)."""
+    hot_keys.record("address", address)
+    if matched_address and search_key(matched_address) != search_key(address):
+        hot_keys.record("address", matched_address)
+    if city:
+        hot_keys.record("area", ", ".join(p for p in (city, state) if p))
+
+
+async def _placeholder_images(property_data: Any, city: Optional[str]) -> Optional[list[dict]]:
+    if not (property_data and UNSPLASH_ACCESS_KEY and UNSPLASH_ACCESS_KEY.strip()):
+        return None
+    prop_type = None
+    if isinstance(property_data, dict):
+        prop_type = property_data.get("propertyType") or property_data.get("type")
+    url = await traced("placeholder_image", get_placeholder_image(city=city, property_type=prop_type))
+    if url:
+        return [{"url": url, "placeholder": True}]
+    return None
+
+
+def _map_schools(schools_list: list[SchoolRecord]) -> list[Any]:
+    """Records as map pins; a school without coordinates gets an explicit (0, 0) pin as before."""
+    return [
+        s if s.lat is not None and s.lon is not None
+        else MapSchool(name=s.name, lat=0, lon=0, street=s.street, city=s.city, state=s.state, zip=s.zip)
+        for s in schools_list
+    ]
+
+
+def _assemble_profile(
+    geo: dict,
+    address: str,
+    radius_km: float,
+    schools_list: list[SchoolRecord],
+    property_data: Optional[dict],
+    poi_list: list[PlaceRecord],
+    news_list: list[dict],
+    images_out: Optional[list[dict]],
+    stats: Optional[dict] = None,
+    places_truncated: Optional[bool] = None,
+) -> PropertyProfileResponse:
+    """
+    Build the response; poi_list (nearest first) is capped at MAX_PLACES. School and place records
+    are handed to the response model as-is and converted in one validation pass (from_attributes).
+    """
+    lat = geo["lat"]
+    lon = geo["lon"]
+    if places_truncated is None:
+        places_truncated = len(poi_list) > MAX_PLACES
+    poi_list = poi_list[:MAX_PLACES]
+
+    with span("demographics"):
+        acs = demographics.lookup(geo.get("geographies"))
+    with span("assigned_district"):
+        district = districts.assigned_district(lat, lon, schools_list)
+
+    with span("build_response", schools=len(schools_list), places=len(poi_list)):
+        return PropertyProfileResponse(
+            location=Location(
+                normalized_address=geo.get("matched_address") or address,
+                lat=lat,
+                lon=lon,
+                census_geography=geo.get("geographies"),
+            ),
+            map=MapData(center={"lat": lat, "lon": lon}, schools=_map_schools(schools_list)),
+            schools=schools_list,
+            property=property_data,
+            property_message="No property data for this address." if property_data is None else None,
+            listings=None,
+            images=images_out,
+            nearby_places=poi_list,
+            nearby_places_truncated=places_truncated,
+            radius_km=radius_km,
+            local_news=[NewsItem(**n) for n in news_list] if news_list else None,
+            neighborhood_stats=NeighborhoodStats(**stats) if stats else None,
+            demographics=Demographics(**acs) if acs else None,
+            assigned_district=AssignedDistrict(**district) if district else None,
+        )
+
+
 async def build_property_profile(
     address: str,
     radius_km: float = 2.0,
@@ -39,92 +135,257 @@ async def build_property_profile(
     """
     Geocode address, then fetch schools, property, and nearby POI in parallel.
     Returns PropertyProfileResponse or None if address could not be geocoded.
+    Runs under admission control for the caller's priority class (raises Overloaded when shed).
     """
     address = (address or "").strip()
     if not address:
         return None
 
-    geo = await geocode_address_with_geographies(address)
+    async with admission():
+        return await _build_property_profile(address, radius_km)
+
+
+async def _build_property_profile(address: str, radius_km: float) -> Optional[PropertyProfileResponse]:
+    geo = await traced("geocode", geocode_address_with_geographies(address))
     if not geo:
         return None
 
     lat = geo["lat"]
     lon = geo["lon"]
     normalized_address = geo.get("matched_address") or address
-    census_geography = geo.get("geographies")
 
     radius_km = max(0.5, min(10.0, radius_km))
-
-    schools_task = get_schools_near_point(lon, lat, radius_km=5.0)
-    property_task = get_property_by_address(address)
-    poi_task = get_nearby_poi(lat, lon, radius_km=radius_km)
     city, state = _city_state_from_address(normalized_address)
-    news_task = get_local_news(city=city, state=state)
+    _record_hot_keys(address, normalized_address, city, state)
+
+    schools_task = traced("schools", get_schools_near_point(lon, lat, radius_km=SCHOOLS_RADIUS_KM))
+    property_task = traced("property", get_property_by_address(address))
+    # Fetch every POI in the radius (stats need them all); the response lists the nearest MAX_PLACES
+    poi_task = traced(
+        "nearby_poi", get_nearby_poi(lat, lon, radius_km=radius_km, limit=MAX_AREA_PLACES), radius_km=radius_km
+    )
+    news_task = traced("local_news", get_local_news(city=city, state=state))
 
     schools_list, property_data, poi_list, news_list = await asyncio.gather(
         schools_task, property_task, poi_task, news_task
     )
+    stats = neighborhood.get_cached_stats(lat, lon, radius_km)
+    if stats is None:
+        with span("neighborhood_stats", places=len(poi_list), schools=len(schools_list)):
+            stats = neighborhood.stats_for_cell(lat, lon, poi_list, schools_list, radius_km)
 
-    map_schools = [
-        MapSchool(
-            name=s["name"],
-            lat=s.get("lat") or 0,
-            lon=s.get("lon") or 0,
-            street=s.get("street"),
-            city=s.get("city"),
-            state=s.get("state"),
-            zip=s.get("zip"),
-        )
-        for s in schools_list
-    ]
-    school_models = [
-        School(
-            name=s["name"],
-            nces_id=s.get("nces_id"),
-            street=s.get("street"),
-            city=s.get("city"),
-            state=s.get("state"),
-            zip=s.get("zip"),
-            lat=s.get("lat"),
-            lon=s.get("lon"),
-        )
-        for s in schools_list
-    ]
+    images_out = await _placeholder_images(property_data, city)
+    return _assemble_profile(
+        geo, address, radius_km, schools_list, property_data, poi_list, news_list, images_out, stats
+    )
 
-    nearby_place_models = [
-        NearbyPlace(
-            name=p["name"],
-            lat=p["lat"],
-            lon=p["lon"],
-            category=p["category"],
-            address=p.get("address"),
-        )
-        for p in poi_list
+
+def _summarize(address: str, profile: PropertyProfileResponse, poi_list: list[PlaceRecord]) -> ComparisonSummary:
+    """Summary row; place counts come from poi_list (every place in the radius), not the capped profile list."""
+    lat, lon = profile.location.lat, profile.location.lon
+    school_km = [
+        haversine_km(lat, lon, s.lat, s.lon)
+        for s in profile.schools
+        if s.lat is not None and s.lon is not None
     ]
+    nearest_by_category: dict[str, float] = {}
+    for p in poi_list:
+        d = haversine_km(lat, lon, p.lat, p.lon)
+        if d < nearest_by_category.get(p.category, float("inf")):
+            nearest_by_category[p.category] = d
+    return ComparisonSummary(
+        address=address,
+        normalized_address=profile.location.normalized_address,
+        school_count=len(profile.schools),
+        nearest_school_km=round(min(school_km), 3) if school_km else None,
+        place_count=len(poi_list),
+        places_by_category=dict(Counter(p.category for p in poi_list)),
+        nearest_place_km={c: round(d, 3) for c, d in sorted(nearest_by_category.items())},
+        has_property_data=profile.property is not None,
+    )
+
+
+async def build_property_comparison(
+    addresses: list[str],
+    radius_km: float = 2.0,
+) -> PropertyComparisonResponse:
+    """
+    Build profiles for several addresses together. Addresses whose points fall within
+    MAX_REGION_SPAN_KM of each other share one schools and one POI query over the union area;
+    news is fetched once per city. Results are split back per address with the same
+    filters a single profile uses (±5 km square for schools, radius_km circle for POI). A shared POI
+    box that hits MAX_AREA_PLACES is discarded in favour of per-address queries.
+    """
+    async with admission():
+        return await _build_property_comparison(addresses, radius_km)
+
+
+async def _build_property_comparison(addresses: list[str], radius_km: float) -> PropertyComparisonResponse:
+    radius_km = max(0.5, min(10.0, radius_km))
+    addresses = [a.strip() for a in addresses]
+
+    geos = await traced(
+        "geocode",
+        asyncio.gather(*(geocode_address_with_geographies(a) for a in addresses)),
+        addresses=len(addresses),
+    )
+    found = [i for i, g in enumerate(geos) if g]
+    not_found = [addresses[i] for i, g in enumerate(geos) if not g]
+    if not found:
+        return PropertyComparisonResponse(radius_km=radius_km, profiles=[], summaries=[], not_found=not_found)
+
+    points = [(geos[i]["lat"], geos[i]["lon"]) for i in found]
+    regions = [[found[j] for j in g] for g in group_nearby(points, MAX_REGION_SPAN_KM)]
+    areas: dict[int, tuple[Optional[str], Optional[str]]] = {}
+    for i in found:
+        areas[i] = _city_state_from_address(geos[i].get("matched_address") or addresses[i])
+        _record_hot_keys(addresses[i], geos[i].get("matched_address") or addresses[i], *areas[i])
+
+    async def _region_schools(region: list[int]) -> list[dict]:
+        s, w, n, e = bbox_around([(geos[i]["lat"], geos[i]["lon"]) for i in region], SCHOOLS_RADIUS_KM)
+        return await get_schools_in_bbox(w, s, e, n)
 
-    images_out = None
-    if property_data and UNSPLASH_ACCESS_KEY and UNSPLASH_ACCESS_KEY.strip():
-        prop_type = None
-        if isinstance(property_data, dict):
-            prop_type = property_data.get("propertyType") or property_data.get("type")
-        url = await get_placeholder_image(city=city, property_type=prop_type)
-        if url:
-            images_out = [{"url": url, "placeholder": True}]
-
-    return PropertyProfileResponse(
-        location=Location(
-            normalized_address=normalized_address,
-            lat=lat,
-            lon=lon,
-            census_geography=census_geography,
-        ),
-        map=MapData(center={"lat": lat, "lon": lon}, schools=map_schools),
-        schools=school_models,
-        property=property_data,
-        property_message="No property data for this address." if property_data is None else None,
-        listings=None,
-        images=images_out,
-        nearby_places=nearby_place_models,
+    async def _address_pois(i: int) -> list[PlaceRecord]:
+        return await get_nearby_poi(geos[i]["lat"], geos[i]["lon"], radius_km=radius_km, limit=MAX_AREA_PLACES)
+
+    async def _region_pois(region: list[int]) -> dict[int, list[PlaceRecord]]:
+        """POI within radius_km of each address in the region, nearest first."""
+        if len(region) > 1:
+            s, w, n, e = bbox_around([(geos[i]["lat"], geos[i]["lon"]) for i in region], radius_km)
+            shared = await get_pois_in_bbox(s, w, n, e)
+            # A capped box holds an arbitrary subset, so splitting it could miss nearer places
+            if len(shared) < MAX_AREA_PLACES:
+                out = {}
+                for i in region:
+                    lat, lon = geos[i]["lat"], geos[i]["lon"]
+                    by_distance = sorted(
+                        (d, j) for j, p in enumerate(shared)
+                        if (d := haversine_km(lat, lon, p.lat, p.lon)) <= radius_km
+                    )
+                    out[i] = [shared[j] for _, j in by_distance]
+                return out
+        return dict(zip(region, await asyncio.gather(*(_address_pois(i) for i in region))))
+
+    unique_areas = sorted(set(areas.values()), key=str)
+    schools_by_region, pois_by_region, property_list, news_by_area = await asyncio.gather(
+        traced("schools", asyncio.gather(*(_region_schools(r) for r in regions)), regions=len(regions)),
+        traced("nearby_poi", asyncio.gather(*(_region_pois(r) for r in regions)), regions=len(regions)),
+        traced("property", asyncio.gather(*(get_property_by_address(addresses[i]) for i in found))),
+        traced("local_news", asyncio.gather(*(get_local_news(city=c, state=s) for c, s in unique_areas))),
+    )
+    news = dict(zip(unique_areas, news_by_area))
+    properties = dict(zip(found, property_list))
+
+    built: list[tuple[int, PropertyProfileResponse, ComparisonSummary]] = []
+    for region, region_schools, region_pois in zip(regions, schools_by_region, pois_by_region):
+        for i in region:
+            lat, lon = geos[i]["lat"], geos[i]["lon"]
+            schools_list = [
+                s for s in region_schools
+                if s.lat is not None and s.lon is not None
+                and in_square(s.lat, s.lon, lat, lon, SCHOOLS_RADIUS_KM)
+            ]
+            poi_list = region_pois[i]
+            stats = neighborhood.get_cached_stats(lat, lon, radius_km)
+            if stats is None:
+                stats = neighborhood.stats_for_cell(lat, lon, poi_list, schools_list, radius_km)
+            images_out = await _placeholder_images(properties[i], areas[i][0])
+            profile = _assemble_profile(
+                geos[i], addresses[i], radius_km, schools_list, properties[i],
+                poi_list, news[areas[i]], images_out, stats,
+            )
+            built.append((i, profile, _summarize(addresses[i], profile, poi_list)))
+
+    built.sort(key=lambda item: item[0])  # back to request order
+    return PropertyComparisonResponse(
         radius_km=radius_km,
-        local_news=[NewsItem(**n) for n in news_list] if news_list else None,
+        profiles=[p for _, p, _ in built],
+        summaries=[s for _, _, s in built],
+        not_found=not_found,
+    )
+
+
+async def build_nearby_section(lat: float, lon: float, radius_km: float = 2.0) -> NearbyResponse:
+    """
+    Nearby places and neighbourhood stats for a point, without geocoding, property or news.
+    Used when the UI changes radius_km; answered from the per-location POI cache when a wider
+    radius was already fetched.
+    """
+    async with admission():
+        schools_list, poi_list = await asyncio.gather(
+            traced("schools", get_schools_near_point(lon, lat, radius_km=SCHOOLS_RADIUS_KM)),
+            traced(
+                "nearby_poi",
+                get_nearby_poi(lat, lon, radius_km=radius_km, limit=MAX_AREA_PLACES),
+                radius_km=radius_km,
+            ),
+        )
+    stats = neighborhood.get_cached_stats(lat, lon, radius_km)
+    if stats is None:
+        with span("neighborhood_stats", places=len(poi_list), schools=len(schools_list)):
+            stats = neighborhood.stats_for_cell(lat, lon, poi_list, schools_list, radius_km)
+    return NearbyResponse(
+        lat=lat,
+        lon=lon,
+        radius_km=radius_km,
+        nearby_places=poi_list[:MAX_PLACES],
+        nearby_places_truncated=len(poi_list) > MAX_PLACES,
+        neighborhood_stats=NeighborhoodStats(**stats) if stats else None,
+    )
+
+
+PROFILE_SECTIONS = ("location", "schools", "property", "nearby_places", "local_news")
+
+
+async def rebuild_profile_sections(
+    previous: PropertyProfileResponse,
+    address: str,
+    sections: set[str],
+) -> Optional[PropertyProfileResponse]:
+    """
+    Re-fetch only the given sections of an existing profile and reassemble it.
+    A lapsed "location" means the point may have moved, so everything is rebuilt.
+    """
+    if "location" in sections:
+        return await build_property_profile(address, radius_km=previous.radius_km or 2.0)
+
+    loc = previous.location
+    geo = {
+        "lat": loc.lat,
+        "lon": loc.lon,
+        "matched_address": loc.normalized_address,
+        "geographies": loc.census_geography,
+    }
+    radius_km = previous.radius_km or 2.0
+    city, state = _city_state_from_address(loc.normalized_address)
+
+    async def _keep(value):
+        return value
+
+    # Stats count every POI in the radius, but previous.nearby_places is capped at MAX_PLACES: whenever
+    # stats are recomputed, POI is refetched uncapped (normally from the per-location cache)
+    recompute_stats = bool(sections & {"schools", "nearby_places"}) or previous.neighborhood_stats is None
+    refetch_poi = "nearby_places" in sections or recompute_stats
+
+    async with admission():
+        schools_list, property_data, poi_list, news_list = await asyncio.gather(
+            get_schools_near_point(loc.lon, loc.lat, radius_km=SCHOOLS_RADIUS_KM)
+            if "schools" in sections else _keep([SchoolRecord(**s.model_dump()) for s in previous.schools]),
+            get_property_by_address(address)
+            if "property" in sections else _keep(previous.property),
+            get_nearby_poi(loc.lat, loc.lon, radius_km=radius_km, limit=MAX_AREA_PLACES)
+            if refetch_poi else _keep([PlaceRecord(**p.model_dump()) for p in previous.nearby_places]),
+            get_local_news(city=city, state=state)
+            if "local_news" in sections else _keep([n.model_dump() for n in previous.local_news or []]),
+        )
+        images_out = (
+            await _placeholder_images(property_data, city) if "property" in sections else previous.images
+        )
+    if recompute_stats:
+        stats = neighborhood.stats_for_cell(loc.lat, loc.lon, poi_list, schools_list, radius_km)
+    else:
+        stats = previous.neighborhood_stats.model_dump()
+    return _assemble_profile(
+        geo, address, radius_km, schools_list, property_data, poi_list, news_list, images_out, stats,
+        places_truncated=None if refetch_poi else previous.nearby_places_truncated,
     )
@@ -0,0 +1,102 @@
+"""In-process TTL cache for upstream results (geocode, schools, POI, news)."""
+import time
+from typing import Any, Optional
+
+MAX_ENTRIES = 20_000
+
+# (namespace, key) -> (expires_at, value); insertion order doubles as eviction order
+_store: dict[tuple[str, str], tuple[float, Any]] = {}
+# (namespace, key) -> upstream validators (ETag / Last-Modified) for conditional refresh
+_validators: dict[tuple[str, str], dict[str, str]] = {}
+
+
+def get_cached(namespace: str, key: str, refresh_within: float = 0.0) -> Optional[Any]:
+    """
+    Return the cached value, or None if missing or expired.
+    With refresh_within > 0, entries expiring within that many seconds also count as a miss
+    (used by the warm-up scheduler to refresh popular keys before they lapse).
+    """
+    entry = _store.get((namespace, key))
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at - refresh_within <= time.time():
+        return None
+    return value
+
+
+def set_cached(
+    namespace: str,
+    key: str,
+    value: Any,
+    ttl: float,
+    validators: Optional[dict[str, str]] = None,
+) -> None:
+    """
+    Store value for ttl seconds, evicting expired then oldest entries when full.
+    validators (see validators_from) are kept with the entry for a later conditional refresh.
+    """
+    _store.pop((namespace, key), None)
+    _validators.pop((namespace, key), None)
+    if len(_store) >= MAX_ENTRIES:
+        _evict()
+    _store[(namespace, key)] = (time.time() + ttl, value)
+    if validators:
+        _validators[(namespace, key)] = validators
+
+
+def get_stale(namespace: str, key: str) -> Optional[tuple[Any, dict[str, str]]]:
+    """
+    (value, validators) even if the entry has expired (until it is evicted), or None.
+    Used on a miss to revalidate the previous value instead of refetching it in full.
+    """
+    entry = _store.get((namespace, key))
+    if entry is None:
+        return None
+    return entry[1], _validators.get((namespace, key), {})
+
+
+def extend(namespace: str, key: str, ttl: float) -> None:
+    """Keep the current value for another ttl seconds (upstream said it has not changed)."""
+    entry = _store.pop((namespace, key), None)
+    if entry is not None:
+        _store[(namespace, key)] = (time.time() + ttl, entry[1])  # re-inserted: now the newest
+
+
+def validators_from(headers: Any) -> dict[str, str]:
+    """ETag / Last-Modified from an upstream response's headers."""
+    return {name: headers[name] for name in ("etag", "last-modified") if headers.get(name)}
+
+
+def conditional_headers(validators: Optional[dict[str, str]]) -> dict[str, str]:
+    """If-None-Match / If-Modified-Since request headers for stored validators."""
+    headers = {}
+    if validators and validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators and validators.get("last-modified"):
+        headers["If-Modified-Since"] = validators["last-modified"]
+    return headers
+
+
+def ttl_remaining(namespace: str, key: str) -> Optional[float]:
+    """Seconds until the entry expires (negative once expired), or None if not cached."""
+    entry = _store.get((namespace, key))
+    if entry is None:
+        return None
+    return entry[0] - time.time()
+
+
+def clear() -> None:
+    _store.clear()
+    _validators.clear()
+
+
+def _evict() -> None:
+    now = time.time()
+    for k in [k for k, (exp, _) in _store.items() if exp <= now]:
+        del _store[k]
+        _validators.pop(k, None)
+    while len(_store) >= MAX_ENTRIES:
+        k = next(iter(_store))
+        del _store[k]
+        _validators.pop(k, None)
@@ -0,0 +1,215 @@
+"""ACS 5-year demographics by census tract / block group, served from a local memory-mapped store.
+
+Ingest tables downloaded from the Census Data API (JSON) or data.census.gov (CSV) once per release:
+
+    python -m app.services.demographics ingest acs_tracts.json acs_block_groups.csv --vintage 2022
+
+The store is columnar: a sorted GEOID array plus one float32 array per field, each a .npy file that
+is memory-mapped on first lookup, so a lookup is a binary search over pages the OS already caches.
+"""
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional
+
+from app.config import DATA_DIR
+
+if TYPE_CHECKING:
+    import numpy as np  # imported on first use (ingest / first lookup with a store) to keep startup fast
+
+logger = logging.getLogger(__name__)
+
+ACS_DIR = DATA_DIR / "acs"
+META_PATH = ACS_DIR / "meta.json"
+RELOAD_INTERVAL = 60.0
+
+# Response field -> ACS 5-year variable (estimate)
+FIELDS = {
+    "population": "B01003_001E",
+    "median_age": "B01002_001E",
+    "median_household_income": "B19013_001E",
+    "median_home_value": "B25077_001E",
+    "median_gross_rent": "B25064_001E",
+    "owner_occupied_units": "B25003_002E",
+    "renter_occupied_units": "B25003_003E",
+}
+GEOID_LEN = {"tract": 11, "block_group": 12}
+
+_store: Optional[dict[str, Any]] = None
+_meta_mtime = 0.0
+_checked = 0.0
+
+
+def _column_path(name: str) -> Path:
+    return ACS_DIR / f"{name}.npy"
+
+
+def _geoid_from_row(row: dict[str, str]) -> Optional[str]:
+    """GEOID from a GEO_ID like "1500000US060855001001" or from state/county/tract[/block group] columns."""
+    geo_id = row.get("GEO_ID") or row.get("GEOID") or ""
+    if "US" in geo_id:
+        geoid = geo_id.rpartition("US")[2]
+    elif geo_id:
+        geoid = geo_id
+    elif row.get("state") and row.get("county") and row.get("tract"):
+        geoid = row["state"] + row["county"] + row["tract"] + (row.get("block group") or "")
+    else:
+        return None
+    return geoid if len(geoid) in GEOID_LEN.values() and geoid.isdigit() else None
+
+
+def _read_rows(path: Path) -> Iterator[dict[str, str]]:
+    """Rows of a Census API JSON table (list of lists, header first) or a CSV with a header row."""
+    if path.suffix.lower() == ".json":
+        with open(path) as f:
+            table = json.load(f)
+        header = table[0]
+        for values in table[1:]:
+            yield dict(zip(header, (v if v is not None else "" for v in values)))
+        return
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from csv.DictReader(f)
+
+
+def _value(raw: Optional[str]) -> float:
+    """ACS annotations (negative sentinels such as -666666666, blanks, "-") become NaN."""
+    try:
+        v = float(raw)
+    except (TypeError, ValueError):
+        return math.nan
+    return v if v >= 0 else math.nan
+
+
+def ingest(paths: Iterable[Path], vintage: Optional[str] = None) -> int:
+    """Replace the store with the tract/block-group rows in paths. Returns the number of GEOIDs."""
+    import numpy as np
+
+    rows: dict[str, list[float]] = {}
+    for path in paths:
+        n = 0
+        for row in _read_rows(path):
+            geoid = _geoid_from_row(row)
+            if geoid is None:
+                continue  # descriptive second header row, other summary levels
+            values = rows.setdefault(geoid, [math.nan] * len(FIELDS))
+            for i, var in enumerate(FIELDS.values()):
+                if var in row:
+                    values[i] = _value(row[var])
+            n += 1
+        logger.info("Read %d rows from %s", n, path)
+
+    geoids = np.array(sorted(rows), dtype=f"S{max(GEOID_LEN.values())}")
+    table = np.array([rows[g.decode()] for g in geoids], dtype=np.float32).reshape(len(geoids), len(FIELDS))
+    ACS_DIR.mkdir(parents=True, exist_ok=True)
+
+    def _save(name: str, arr: "np.ndarray") -> None:
+        tmp = ACS_DIR / f"{name}.tmp.npy"
+        np.save(tmp, arr)
+        os.replace(tmp, _column_path(name))
+
+    _save("geoid", geoids)
+    for i, field in enumerate(FIELDS):
+        _save(field, np.ascontiguousarray(table[:, i]))
+    tmp = META_PATH.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"vintage": vintage, "fields": list(FIELDS), "count": len(geoids), "built_at": time.time()}, f)
+    os.replace(tmp, META_PATH)  # written last: readers reload when it changes
+    return len(geoids)
+
+
+def _load() -> Optional[dict[str, Any]]:
+    import numpy as np
+
+    try:
+        with open(META_PATH) as f:
+            meta = json.load(f)
+        columns = {
+            field: np.load(_column_path(field), mmap_mode="r")
+            for field in meta["fields"]
+            if _column_path(field).is_file()
+        }
+        geoids = np.load(_column_path("geoid"), mmap_mode="r")
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("ACS store unreadable: %s", e)
+        return None
+    return {"meta": meta, "geoid": geoids, "columns": columns}
+
+
+def _current_store() -> Optional[dict[str, Any]]:
+    """The mapped store, re-opened when a new ingest has replaced it (checked every RELOAD_INTERVAL)."""
+    global _store, _meta_mtime, _checked
+    now = time.time()
+    if now - _checked >= RELOAD_INTERVAL:
+        _checked = now
+        try:
+            mtime = META_PATH.stat().st_mtime
+        except OSError:
+            mtime = 0.0
+        if mtime != _meta_mtime:
+            _store, _meta_mtime = (_load() if mtime else None), mtime
+    return _store
+
+
+def _geoids_from_geography(geographies: Optional[dict]) -> list[tuple[str, str]]:
+    """(level, GEOID) candidates, most specific first, from the Census Geocoder's geographies."""
+    if not geographies:
+        return []
+    out = []
+    for name, layer in geographies.items():
+        if not layer or "Block" not in name or "Group" in name:
+            continue
+        block = str(layer[0].get("GEOID") or "")
+        if len(block) == 15:
+            out.append(("block_group", block[:12]))  # a block GEOID is its block group's GEOID + 3 digits
+            break
+    tracts = geographies.get("Census Tracts") or []
+    if tracts and tracts[0].get("GEOID"):
+        out.append(("tract", str(tracts[0]["GEOID"])))
+    return out
+
+
+def lookup(geographies: Optional[dict]) -> Optional[dict[str, Any]]:
+    """
+    ACS values for the most specific ingested area (block group, else tract) of a geocoded point,
+    with fields the block group table lacks taken from the tract. None if no store is ingested
+    or neither area is in it. No network access.
+    """
+    store = _current_store()
+    if store is None:
+        return None
+    geoids = store["geoid"]
+    out: Optional[dict[str, Any]] = None
+    for level, geoid in _geoids_from_geography(geographies):
+        key = geoid.encode()
+        i = int(geoids.searchsorted(key))
+        if i >= len(geoids) or geoids[i] != key:
+            continue
+        if out is None:
+            out = {"geoid": geoid, "level": level, "vintage": store["meta"].get("vintage")}
+        for field, column in store["columns"].items():
+            v = float(column[i])
+            if out.get(field) is None and not math.isnan(v):
+                out[field] = round(v, 1) if field == "median_age" else int(v)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the local ACS 5-year demographics store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ing = sub.add_parser("ingest", help="Replace the store with tract / block-group tables (JSON or CSV).")
+    ing.add_argument("files", nargs="+", help="Census API JSON or data.census.gov CSV files")
+    ing.add_argument("--vintage", help="ACS release, e.g. 2022 (reported with each lookup)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    n = ingest([Path(p) for p in args.files], vintage=args.vintage)
+    print(json.dumps({"geoids": n, "path": str(ACS_DIR)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""NCES school districts (LEAs): local boundary index with point-in-polygon lookup, schools grouped per LEAID.
+
+Ingest EDGE school-district boundaries (GeoJSON; unified, elementary and secondary layers can be
+mixed) and, optionally, the EDGE public school locations (CSV or GeoJSON) once per release:
+
+    python -m app.services.districts ingest sd_unified.geojson sd_elsec.geojson \\
+        --schools school_locations.csv --vintage 2023
+
+The store is memory-mapped like the ACS store: per-district bounding boxes and vertex offsets plus
+one coordinate array (rings separated by NaN rows), so a lookup is a vectorized bbox filter and an
+even-odd test over the few candidates' vertices. Schools are written grouped by LEAID, so a
+district's list is one seek and read, cached per LEAID; no MapServer query is involved.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional
+
+from app.config import DATA_DIR
+from app.services import cache
+from app.services.records import SchoolRecord
+
+if TYPE_CHECKING:
+    import numpy as np  # imported on first use (ingest / first lookup with a store) to keep startup fast
+
+logger = logging.getLogger(__name__)
+
+DISTRICTS_DIR = DATA_DIR / "districts"
+META_PATH = DISTRICTS_DIR / "meta.json"
+SCHOOLS_PATH = DISTRICTS_DIR / "schools.jsonl"
+RELOAD_INTERVAL = 60.0
+SCHOOLS_CACHE_TTL = 24 * 3600
+LEAID_LEN = 7
+GRADES = ("PK", "KG", "01", "02", "03", "04", "05", "06", "07", "08", "09", "10", "11", "12")
+
+_store: Optional[dict[str, Any]] = None
+_meta_mtime = 0.0
+_checked = 0.0
+
+
+def _column_path(name: str) -> Path:
+    return DISTRICTS_DIR / f"{name}.npy"
+
+
+def _prop(props: dict, *names: str) -> Optional[str]:
+    for name in names:
+        value = props.get(name)
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+
+def _leaid(props: dict) -> Optional[str]:
+    """7-digit LEAID from LEAID / GEOID (boundary layers) or from a 12-digit NCESSCH (school files)."""
+    lea = _prop(props, "LEAID", "GEOID")
+    if lea is None and (sch := _prop(props, "NCESSCH")):
+        lea = sch[:LEAID_LEN]
+    return lea.zfill(LEAID_LEN) if lea and lea.isdigit() and len(lea) <= LEAID_LEN else None
+
+
+def _grade_span(lo: Optional[str], hi: Optional[str]) -> int:
+    """Number of grades served (0 if unknown); a unified district outranks an overlapping elementary one."""
+    try:
+        return GRADES.index(hi) - GRADES.index(lo) + 1
+    except ValueError:
+        return 0
+
+
+def _rings(geometry: Optional[dict]) -> list[list]:
+    """Outer rings and holes of a Polygon / MultiPolygon; even-odd filling handles holes without labelling them."""
+    if not geometry:
+        return []
+    if geometry.get("type") == "Polygon":
+        return list(geometry["coordinates"])
+    if geometry.get("type") == "MultiPolygon":
+        return [ring for polygon in geometry["coordinates"] for ring in polygon]
+    return []
+
+
+def _read_features(path: Path) -> Iterator[dict]:
+    with open(path) as f:
+        data = json.load(f)
+    yield from data.get("features") or []
+
+
+def _read_school_rows(path: Path) -> Iterator[dict]:
+    """School attribute rows from an EDGE CSV or a GeoJSON / ArcGIS JSON feature collection."""
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+        return
+    for feature in _read_features(path):
+        row = dict(feature.get("properties") or feature.get("attributes") or {})
+        coords = (feature.get("geometry") or {}).get("coordinates")
+        if coords and "LAT" not in row:
+            row["LON"], row["LAT"] = coords[0], coords[1]
+        yield row
+
+
+def _school_entry(row: dict) -> dict:
+    def _float(name: str) -> Optional[float]:
+        try:
+            return float(row[name])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    return {
+        "name": _prop(row, "NAME", "SCH_NAME") or "",
+        "nces_id": _prop(row, "NCESSCH"),
+        "street": _prop(row, "STREET"),
+        "city": _prop(row, "CITY"),
+        "state": _prop(row, "STATE"),
+        "zip": _prop(row, "ZIP"),
+        "lat": _float("LAT"),
+        "lon": _float("LON"),
+        "lea_id": _leaid(row),
+    }
+
+
+def ingest(boundary_paths: Iterable[Path], school_paths: Iterable[Path] = (), vintage: Optional[str] = None) -> dict:
+    """Replace the store with the districts (and schools) in the given files. Returns counts."""
+    import numpy as np
+
+    districts: list[dict] = []
+    bboxes: list[tuple[float, float, float, float]] = []
+    parts: list["np.ndarray"] = []
+    vert_start = [0]
+    sep = np.full((1, 2), np.nan)
+    for path in boundary_paths:
+        n = 0
+        for feature in _read_features(path):
+            props = feature.get("properties") or {}
+            lea_id = _leaid(props)
+            rings = [np.asarray(r, dtype=np.float64)[:, :2] for r in _rings(feature.get("geometry")) if len(r) >= 4]
+            if lea_id is None or not rings:
+                continue  # "school district not defined" areas, empty geometries
+            coords = np.concatenate([x for r in rings for x in (r, sep)])
+            parts.append(coords)
+            vert_start.append(vert_start[-1] + len(coords))
+            bboxes.append((np.nanmin(coords[:, 0]), np.nanmin(coords[:, 1]),
+                           np.nanmax(coords[:, 0]), np.nanmax(coords[:, 1])))
+            districts.append({
+                "lea_id": lea_id,
+                "name": _prop(props, "NAME") or lea_id,
+                "state": _prop(props, "STATEFP", "STATE"),
+                "lograde": _prop(props, "LOGRADE"),
+                "higrade": _prop(props, "HIGRADE"),
+            })
+            n += 1
+        logger.info("Read %d districts from %s", n, path)
+
+    groups: dict[str, list[dict]] = {}
+    for path in school_paths:
+        n = 0
+        for row in _read_school_rows(path):
+            entry = _school_entry(row)
+            if entry["lea_id"] and entry["name"]:
+                groups.setdefault(entry["lea_id"], []).append(entry)
+                n += 1
+        logger.info("Read %d schools from %s", n, path)
+
+    DISTRICTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    def _save(name: str, arr: "np.ndarray") -> None:
+        tmp = DISTRICTS_DIR / f"{name}.tmp.npy"
+        np.save(tmp, arr)
+        os.replace(tmp, _column_path(name))
+
+    # Stored as 4 contiguous rows (min lon, min lat, max lon, max lat): the filter scans each one sequentially
+    _save("bbox", np.ascontiguousarray(np.array(bboxes, dtype=np.float64).reshape(len(bboxes), 4).T))
+    _save("vert_start", np.array(vert_start, dtype=np.int64))
+    _save("coords", np.concatenate(parts) if parts else np.empty((0, 2)))
+
+    leas = sorted(groups)
+    offsets = [0]
+    tmp = SCHOOLS_PATH.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        for lea_id in leas:
+            for entry in sorted(groups[lea_id], key=lambda e: e["name"]):
+                f.write(json.dumps(entry, separators=(",", ":")).encode() + b"\n")
+            offsets.append(f.tell())
+    os.replace(tmp, SCHOOLS_PATH)
+    _save("school_lea", np.array(leas, dtype=f"S{LEAID_LEN}"))
+    _save("school_offsets", np.array(offsets, dtype=np.int64))
+
+    counts = {"districts": len(districts), "schools": sum(len(g) for g in groups.values()), "school_districts": len(leas)}
+    tmp = META_PATH.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"vintage": vintage, "built_at": time.time(), **counts, "index": districts}, f)
+    os.replace(tmp, META_PATH)  # written last: readers reload when it changes
+    return counts
+
+
+def _load() -> Optional[dict[str, Any]]:
+    import numpy as np
+
+    try:
+        with open(META_PATH) as f:
+            meta = json.load(f)
+        store = {"meta": meta}
+        for name in ("bbox", "vert_start", "coords", "school_lea", "school_offsets"):
+            # Plain ndarray views of the mapping: same pages, without np.memmap's per-slice overhead
+            store[name] = np.asarray(np.load(_column_path(name), mmap_mode="r"))
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("District store unreadable: %s", e)
+        return None
+    return store
+
+
+def _current_store() -> Optional[dict[str, Any]]:
+    """The mapped store, re-opened when a new ingest has replaced it (checked every RELOAD_INTERVAL)."""
+    global _store, _meta_mtime, _checked
+    now = time.time()
+    if now - _checked >= RELOAD_INTERVAL:
+        _checked = now
+        try:
+            mtime = META_PATH.stat().st_mtime
+        except OSError:
+            mtime = 0.0
+        if mtime != _meta_mtime:
+            _store, _meta_mtime = (_load() if mtime else None), mtime
+    return _store
+
+
+def _contains(coords: "np.ndarray", lat: float, lon: float) -> bool:
+    """Even-odd ray cast over every ring at once; edges touching a NaN separator never count as crossings."""
+    import numpy as np
+
+    x1, y1 = coords[:-1, 0], coords[:-1, 1]
+    x2, y2 = coords[1:, 0], coords[1:, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        straddles = (y1 > lat) != (y2 > lat)
+        x_cross = x1 + (lat - y1) * (x2 - x1) / (y2 - y1)
+        return bool(np.count_nonzero(straddles & (lon < x_cross)) % 2)
+
+
+def find_district(lat: float, lon: float) -> Optional[dict[str, Any]]:
+    """
+    The district whose boundary contains the point; where an elementary and a secondary district
+    overlap, the one serving more grades (then the smaller one). None without a store or a match.
+    """
+    store = _current_store()
+    if store is None:
+        return None
+    bbox = store["bbox"]
+    candidates = ((bbox[0] <= lon) & (lon <= bbox[2]) & (bbox[1] <= lat) & (lat <= bbox[3])).nonzero()[0]
+    best, best_rank = None, None
+    for i in candidates:
+        start, end = store["vert_start"][i], store["vert_start"][i + 1]
+        if not _contains(store["coords"][start:end], lat, lon):
+            continue
+        district = store["meta"]["index"][i]
+        area = float((bbox[2, i] - bbox[0, i]) * (bbox[3, i] - bbox[1, i]))
+        rank = (-_grade_span(district.get("lograde"), district.get("higrade")), area)
+        if best_rank is None or rank < best_rank:
+            best, best_rank = district, rank
+    return best
+
+
+def district_schools(lea_id: str) -> Optional[list[SchoolRecord]]:
+    """All ingested schools of a district, by name; None if no school file covered it. Cached per LEAID."""
+    store = _current_store()
+    if store is None:
+        return None
+    key = f"{lea_id}@{store['meta'].get('built_at')}"  # a new ingest invalidates older entries
+    cached = cache.get_cached("district_schools", key)
+    if cached is not None:
+        return cached
+    leas = store["school_lea"]
+    i = int(leas.searchsorted(lea_id.encode()))
+    if i >= len(leas) or leas[i] != lea_id.encode():
+        return None
+    start, end = int(store["school_offsets"][i]), int(store["school_offsets"][i + 1])
+    try:
+        with open(SCHOOLS_PATH, "rb") as f:
+            f.seek(start)
+            lines = f.read(end - start).splitlines()
+    except OSError as e:
+        logger.warning("District schools unreadable: %s", e)
+        return None
+    schools = [SchoolRecord(**json.loads(line)) for line in lines]
+    cache.set_cached("district_schools", key, schools, SCHOOLS_CACHE_TTL)
+    return schools
+
+
+def assigned_district(lat: float, lon: float, nearby_schools: list[SchoolRecord]) -> Optional[dict[str, Any]]:
+    """
+    District containing the point with its schools: the ingested per-LEAID list when available,
+    else the nearby schools (already fetched for the profile) carrying the district's LEAID.
+    """
+    district = find_district(lat, lon)
+    if district is None:
+        return None
+    lea_id = district["lea_id"]
+    schools = district_schools(lea_id)
+    source = "district"
+    if schools is None:
+        schools = [s for s in nearby_schools if s.lea_id == lea_id]
+        source = "nearby"
+    lo, hi = district.get("lograde"), district.get("higrade")
+    return {
+        "lea_id": lea_id,
+        "name": district["name"],
+        "state_fips": district.get("state"),
+        "grades": f"{lo}-{hi}" if lo and hi else None,
+        "school_count": len(schools),
+        "schools": schools,
+        "schools_source": source,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the local NCES school district store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ing = sub.add_parser("ingest", help="Replace the store with district boundaries (GeoJSON) and school locations.")
+    ing.add_argument("boundaries", nargs="+", help="EDGE school district boundary GeoJSON files")
+    ing.add_argument("--schools", nargs="*", default=[], help="EDGE public school location CSV / GeoJSON files")
+    ing.add_argument("--vintage", help="EDGE release, e.g. 2023")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    counts = ingest([Path(p) for p in args.boundaries], [Path(p) for p in args.schools], vintage=args.vintage)
+    print(json.dumps({**counts, "path": str(DISTRICTS_DIR)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Small geometry helpers: great-circle distance, bounding boxes, grouping nearby points."""
+import math
+from typing import Iterable
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.0  # same rough factor the NCES bounding box uses
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bbox_around(points: Iterable[tuple[float, float]], pad_km: float) -> tuple[float, float, float, float]:
+    """(south, west, north, east) covering all (lat, lon) points plus pad_km on each side."""
+    lats, lons = zip(*points)
+    d = pad_km / KM_PER_DEG_LAT
+    return min(lats) - d, min(lons) - d, max(lats) + d, max(lons) + d
+
+
+def in_square(lat: float, lon: float, center_lat: float, center_lon: float, half_km: float) -> bool:
+    """Point inside the ±half_km degree square used for school lookups."""
+    d = half_km / KM_PER_DEG_LAT
+    return abs(lat - center_lat) <= d and abs(lon - center_lon) <= d
+
+
+def group_nearby(points: list[tuple[float, float]], max_span_km: float) -> list[list[int]]:
+    """
+    Greedily group point indexes so each group's bounding box spans at most max_span_km,
+    letting neighbouring homes share one upstream query.
+    """
+    groups: list[list[int]] = []
+    boxes: list[list[float]] = []  # south, west, north, east
+    for i, (lat, lon) in enumerate(points):
+        for g, box in zip(groups, boxes):
+            s, w, n, e = min(box[0], lat), min(box[1], lon), max(box[2], lat), max(box[3], lon)
+            if max(haversine_km(s, w, n, w), haversine_km(s, w, s, e), haversine_km(n, w, n, e)) <= max_span_km:
+                g.append(i)
+                box[:] = [s, w, n, e]
+                break
+        else:
+            groups.append([i])
+            boxes.append([lat, lon, lat, lon])
+    return groups
+
+
+def geohash_encode(lat: float, lon: float, precision: int = 7) -> str:
+    """Standard base-32 geohash (precision 7 is a cell of roughly 150 m x 150 m)."""
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            value = value * 2 + (lon >= mid)
+            lon_lo, lon_hi = (mid, lon_hi) if lon >= mid else (lon_lo, mid)
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            value = value * 2 + (lat >= mid)
+            lat_lo, lat_hi = (mid, lat_hi) if lat >= mid else (lat_lo, mid)
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_ALPHABET[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def geohash_center(cell: str) -> tuple[float, float]:
+    """(lat, lon) at the centre of a geohash cell."""
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    even = True
+    for ch in cell:
+        value = _GEOHASH_ALPHABET.index(ch)
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lon_lo + lon_hi) / 2
+                lon_lo, lon_hi = (mid, lon_hi) if bit else (lon_lo, mid)
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+            even = not even
+    return (lat_lo + lat_hi) / 2, (lon_lo + lon_hi) / 2
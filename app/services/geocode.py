@@ -1,20 +1,35 @@
 """Census Geocoder: address to lat/long and optional census geography."""
 from urllib.parse import urlencode
 
-import httpx
+from app.config import CENSUS_GEOCODER_URL
+from app.services import cache
+from app.services.address_index import index as address_index
+from app.services.http import get_client
 
-BASE_URL = "https://geocoding.geo.census.gov/geocoder"
+BASE_URL = CENSUS_GEOCODER_URL
 BENCHMARK = "Public_AR_Current"
 VINTAGE = "Current_Current"
 TIMEOUT = 15.0
+CACHE_TTL = 30 * 24 * 3600  # addresses rarely move
 
 
-async def geocode_address_with_geographies(address: str):
+def _cache_key(address: str) -> str:
+    return " ".join(address.lower().split())
+
+
+async def geocode_address_with_geographies(address: str, refresh_within: float = 0.0):
     """
     Geocode address and get census geography (one call: geographies/onelineaddress).
     Returns dict with: matched_address, lon, lat, geographies (optional).
-    Returns None if no match.
+    Returns None if no match. Matches are cached for CACHE_TTL under both the input and the
+    matched address, and the matched address is added to the autocomplete index. An expired
+    match is revalidated with a conditional request when the upstream sent validators.
     """
+    key = _cache_key(address)
+    cached = cache.get_cached("geocode", key, refresh_within)
+    if cached is not None:
+        return cached
+    stale, validators = cache.get_stale("geocode", key) or (None, {})
     path = f"{BASE_URL}/geographies/onelineaddress"
     params = {
         "address": address,
@@ -22,10 +37,13 @@ async def geocode_address_with_geographies(address: str):
         "vintage": VINTAGE,
         "format": "json",
     }
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        resp = await client.get(f"{path}?{urlencode(params)}")
-        resp.raise_for_status()
-        data = resp.json()
+    headers = cache.conditional_headers(validators) if stale is not None else {}
+    resp = await get_client().get(f"{path}?{urlencode(params)}", headers=headers, timeout=TIMEOUT)
+    if resp.status_code == 304:
+        cache.extend("geocode", key, CACHE_TTL)
+        return stale
+    resp.raise_for_status()
+    data = resp.json()
     matches = data.get("result", {}).get("addressMatches") or []
     if not matches:
         return None
@@ -35,9 +53,14 @@ async def geocode_address_with_geographies(address: str):
     lat = coords.get("y")
     if lon is None or lat is None:
         return None
-    return {
+    result = {
         "matched_address": match.get("matchedAddress", address),
         "lon": lon,
         "lat": lat,
         "geographies": match.get("geographies"),
     }
+    validators = cache.validators_from(resp.headers)
+    cache.set_cached("geocode", key, result, CACHE_TTL, validators)
+    cache.set_cached("geocode", _cache_key(result["matched_address"]), result, CACHE_TTL, validators)
+    address_index.add(result["matched_address"])
+    return result
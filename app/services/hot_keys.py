@@ -0,0 +1,129 @@
+"""Hot-key tracking: count-min sketch + bounded top-k over profile addresses and areas."""
+import hashlib
+import json
+import logging
+import os
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from app.config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+SKETCH_WIDTH = 4096
+SKETCH_DEPTH = 4
+TOP_K = 200
+HOT_KEYS_PATH = DATA_DIR / "hot_keys.json"
+
+
+def _normalize(key: str) -> str:
+    return " ".join((key or "").lower().split())
+
+
+class CountMinSketch:
+    """Fixed-size frequency estimator (never under-counts; over-counts bounded by width)."""
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self._rows = [array("I", bytes(4 * width)) for _ in range(depth)]
+
+    def _indexes(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        return [
+            int.from_bytes(digest[4 * i:4 * i + 4], "little") % self.width
+            for i in range(self.depth)
+        ]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Increment key and return its new estimate."""
+        estimate = None
+        for row, idx in zip(self._rows, self._indexes(key)):
+            row[idx] = min(row[idx] + count, 0xFFFFFFFF)
+            estimate = row[idx] if estimate is None else min(estimate, row[idx])
+        return estimate or 0
+
+    def estimate(self, key: str) -> int:
+        return min(row[idx] for row, idx in zip(self._rows, self._indexes(key)))
+
+    def halve(self) -> None:
+        """Age all counters so yesterday's hot keys fade out."""
+        for row in self._rows:
+            for i in range(self.width):
+                row[i] >>= 1
+
+
+class HotKeyTracker:
+    """
+    Tracks popular keys per kind ("address", "area") in bounded memory.
+    The sketch counts every key; only the current top-k candidates are kept by name.
+    """
+
+    def __init__(self, top_k: int = TOP_K, path: Optional[Path] = HOT_KEYS_PATH):
+        self.top_k = top_k
+        self.path = path
+        self._sketch = CountMinSketch()
+        self._top: dict[str, int] = {}  # "kind:key" -> estimated count
+        self._dirty = False
+
+    def record(self, kind: str, key: str, count: int = 1) -> None:
+        key = _normalize(key)
+        if not key:
+            return
+        full_key = f"{kind}:{key}"
+        estimate = self._sketch.add(full_key, count)
+        self._dirty = True
+        if full_key in self._top or len(self._top) < self.top_k:
+            self._top[full_key] = estimate
+            return
+        coldest = min(self._top, key=self._top.__getitem__)
+        if estimate > self._top[coldest]:
+            del self._top[coldest]
+            self._top[full_key] = estimate
+
+    def estimate(self, kind: str, key: str) -> int:
+        return self._sketch.estimate(f"{kind}:{_normalize(key)}")
+
+    def top(self, kind: str, n: int = 20) -> list[tuple[str, int]]:
+        """Most popular keys of one kind, as (key, estimated count), hottest first."""
+        prefix = f"{kind}:"
+        items = [(k[len(prefix):], c) for k, c in self._top.items() if k.startswith(prefix)]
+        items.sort(key=lambda kc: kc[1], reverse=True)
+        return items[:n]
+
+    def decay(self) -> None:
+        self._sketch.halve()
+        self._top = {k: c >> 1 for k, c in self._top.items() if c > 1}
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist the top-k (not the sketch) atomically; the sketch is rebuilt from it on load."""
+        if self.path is None or not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump({"version": 1, "top": sorted(self._top.items(), key=lambda kc: -kc[1])}, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning("Could not save hot keys to %s: %s", self.path, e)
+
+    def load(self) -> None:
+        if self.path is None or not self.path.is_file():
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load hot keys from %s: %s", self.path, e)
+            return
+        for full_key, count in data.get("top") or []:
+            kind, _, key = full_key.partition(":")
+            self.record(kind, key, int(count))
+        self._dirty = False
+
+
+tracker = HotKeyTracker()
@@ -0,0 +1,108 @@
+"""Shared upstream HTTP client: one connection pool per process, pre-connected at startup.
+
+Services call get_client() and pass their own per-request timeout, so keep-alive connections
+(DNS, TCP and TLS already done) are reused across requests instead of one client per call.
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import (
+    CENSUS_GEOCODER_URL,
+    NCES_SCHOOLS_URL,
+    NEWSCATCHER_API_KEY,
+    NEWSCATCHER_LOCAL_URL,
+    NEWSCATCHER_URL,
+    OVERPASS_URLS,
+    RENTCAST_API_KEY,
+    RENTCAST_BASE_URL,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 15.0
+PREWARM_TIMEOUT = 5.0  # per host; readiness is reported after every host has been tried
+LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=50, keepalive_expiry=60.0)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_upstreams: dict[str, dict] = {}  # origin -> {"status", "ms"} from the startup pre-connect
+
+
+def _usable(loop: asyncio.AbstractEventLoop) -> bool:
+    return _client is not None and not _client.is_closed and _client_loop is loop
+
+
+def get_client() -> httpx.AsyncClient:
+    """The shared client for the running event loop (created on first use, e.g. per CLI run)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if not _usable(loop):
+        _client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=LIMITS)
+        _client_loop = loop
+    return _client
+
+
+async def open_client() -> None:
+    """Build the shared client in a thread: loading its SSL context takes ~100 ms that would block the loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _usable(loop):
+        return
+    client = await asyncio.to_thread(httpx.AsyncClient, timeout=DEFAULT_TIMEOUT, limits=LIMITS)
+    if _usable(loop):
+        await client.aclose()  # a request created one meanwhile
+        return
+    _client, _client_loop = client, loop
+
+
+async def aclose() -> None:
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+def upstream_origins() -> list[str]:
+    """scheme://host[:port] of every upstream a profile request may call (keyed ones only if configured)."""
+    urls = [CENSUS_GEOCODER_URL, NCES_SCHOOLS_URL, *OVERPASS_URLS]
+    if RENTCAST_API_KEY:
+        urls.append(RENTCAST_BASE_URL)
+    if NEWSCATCHER_API_KEY and NEWSCATCHER_API_KEY.strip():
+        urls += [NEWSCATCHER_LOCAL_URL, NEWSCATCHER_URL]
+    origins = []
+    for url in urls:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if parts.netloc and origin not in origins:
+            origins.append(origin)
+    return origins
+
+
+async def _preconnect(origin: str) -> None:
+    start = time.monotonic()
+    host = urlsplit(origin).hostname
+    try:
+        # Resolve first so DNS failures are reported as such, then open a pooled keep-alive connection
+        await asyncio.get_running_loop().getaddrinfo(host, None)
+        await get_client().head(origin, timeout=PREWARM_TIMEOUT)
+        status = "connected"
+    except Exception as e:
+        status = f"error: {type(e).__name__}"
+    _upstreams[origin] = {"status": status, "ms": round((time.monotonic() - start) * 1000, 1)}
+
+
+async def preconnect_all() -> None:
+    """Resolve and pre-connect every upstream in parallel (failures are recorded, not raised)."""
+    origins = upstream_origins()
+    _upstreams.update({o: {"status": "pending", "ms": None} for o in origins})
+    await asyncio.gather(*(_preconnect(o) for o in origins))
+    logger.info("Upstreams pre-connected: %s", {o: u["status"] for o, u in _upstreams.items()})
+
+
+def upstream_status() -> dict[str, dict]:
+    return dict(_upstreams)
@@ -0,0 +1,106 @@
+"""Local store for placeholder images: one original per image id, resized/WebP variants on demand."""
+import io
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from app.config import DATA_DIR
+from app.services.http import get_client
+
+logger = logging.getLogger(__name__)
+
+IMAGES_DIR = DATA_DIR / "images"
+DOWNLOAD_TIMEOUT = 20.0
+MAX_DOWNLOAD_BYTES = 8 * 1024 * 1024
+WIDTHS = (320, 640, 960, 1280)  # variants are snapped to these so the cache stays bounded
+FORMATS = {"webp": "image/webp", "jpeg": "image/jpeg"}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def is_valid_id(image_id: str) -> bool:
+    return bool(_ID_RE.match(image_id or ""))
+
+
+def _original_path(image_id: str) -> Path:
+    return IMAGES_DIR / image_id / "original"
+
+
+def has_image(image_id: str) -> bool:
+    return is_valid_id(image_id) and _original_path(image_id).is_file()
+
+
+async def download_image(image_id: str, url: str) -> bool:
+    """Fetch the source image once and store it as the original. Returns True if stored (or already present)."""
+    if not is_valid_id(image_id):
+        return False
+    path = _original_path(image_id)
+    if path.is_file():
+        return True
+    content = bytearray()
+    try:
+        async with get_client().stream("GET", url, timeout=DOWNLOAD_TIMEOUT, follow_redirects=True) as resp:
+            resp.raise_for_status()
+            # Stop reading as soon as the body passes the cap instead of buffering all of it
+            async for chunk in resp.aiter_bytes():
+                content += chunk
+                if len(content) > MAX_DOWNLOAD_BYTES:
+                    logger.warning("Image %s too large (over %d bytes); not stored", image_id, MAX_DOWNLOAD_BYTES)
+                    return False
+    except httpx.HTTPError as e:
+        logger.warning("Image download failed for %s: %s", image_id, e)
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(content)
+    tmp.replace(path)
+    return True
+
+
+def snap_width(width: Optional[int]) -> int:
+    if not width:
+        return WIDTHS[1]
+    for w in WIDTHS:
+        if width <= w:
+            return w
+    return WIDTHS[-1]
+
+
+def get_variant(image_id: str, width: int, fmt: str) -> Optional[tuple[Path, str]]:
+    """
+    Return (path, media_type) for the resized variant, creating it on first use.
+    Falls back to the original bytes (as JPEG) when Pillow is not installed.
+    Blocking; call via asyncio.to_thread.
+    """
+    if not has_image(image_id) or fmt not in FORMATS:
+        return None
+    original = _original_path(image_id)
+    variant = original.parent / f"{width}.{fmt}"
+    if variant.is_file():
+        return variant, FORMATS[fmt]
+    try:
+        from PIL import Image
+    except ImportError:
+        return original, FORMATS["jpeg"]
+    try:
+        with Image.open(original) as im:
+            im = im.convert("RGB")
+            if im.width > width:
+                im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+            buf = io.BytesIO()
+            if fmt == "webp":
+                im.save(buf, "WEBP", quality=WEBP_QUALITY, method=4)
+            else:
+                im.save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    except OSError as e:
+        logger.warning("Could not resize image %s: %s", image_id, e)
+        return original, FORMATS["jpeg"]
+    tmp = variant.with_suffix(".tmp")
+    tmp.write_bytes(buf.getvalue())
+    tmp.replace(variant)
+    return variant, FORMATS[fmt]
@@ -0,0 +1,275 @@
+"""Asynchronous profile jobs: persistent SQLite queue + bounded worker pool."""
+import asyncio
+import contextlib
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from typing import Any, Optional
+
+from app.config import JOB_MIN_INTERVAL, JOB_WORKERS, JOBS_DB_PATH
+from app.services.aggregator import build_property_profile
+from app.services.ratelimit import RateLimiter
+from app.services.scheduler import BATCH, Overloaded, set_priority
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 30.0  # delay before retrying a failed item (doubles per attempt)
+RETENTION = 7 * 24 * 3600  # finished jobs older than this are purged at startup
+IDLE_POLL = 5.0
+ERROR_BACKOFF = 1.0  # first pause after a queue error (doubles per consecutive error)
+MAX_ERROR_BACKOFF = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    total INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    radius_km REAL NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    not_before REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS job_items_status ON job_items (status);
+"""
+
+_wakeup: Optional[asyncio.Event] = None
+_workers: list[asyncio.Task] = []
+
+
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(JOBS_DB_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(JOBS_DB_PATH, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def init_db() -> None:
+    """Create tables, requeue items interrupted by a restart, purge old jobs."""
+    with contextlib.closing(_connect()) as conn:
+        conn.executescript(_SCHEMA)
+        columns = {r["name"] for r in conn.execute("PRAGMA table_info(job_items)")}
+        if "not_before" not in columns:  # databases created before retry backoff
+            conn.execute("ALTER TABLE job_items ADD COLUMN not_before REAL NOT NULL DEFAULT 0")
+        conn.execute("UPDATE job_items SET status = 'queued' WHERE status = 'running'")
+        cutoff = time.time() - RETENTION
+        conn.execute(
+            "DELETE FROM job_items WHERE job_id IN (SELECT id FROM jobs WHERE updated_at < ?)", (cutoff,)
+        )
+        conn.execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,))
+
+
+def _insert_job(items: list[tuple[str, float]]) -> str:
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    with contextlib.closing(_connect()) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "INSERT INTO jobs (id, created_at, updated_at, total) VALUES (?, ?, ?, ?)",
+            (job_id, now, now, len(items)),
+        )
+        conn.executemany(
+            "INSERT INTO job_items (job_id, idx, address, radius_km, status) VALUES (?, ?, ?, ?, 'queued')",
+            [(job_id, i, address, radius_km) for i, (address, radius_km) in enumerate(items)],
+        )
+        conn.execute("COMMIT")
+    return job_id
+
+
+def _claim_next() -> Optional[sqlite3.Row]:
+    with contextlib.closing(_connect()) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT rowid, job_id, idx, address, radius_km, attempts FROM job_items "
+            "WHERE status = 'queued' AND not_before <= ? ORDER BY rowid LIMIT 1",
+            (time.time(),),
+        ).fetchone()
+        if row is not None:
+            conn.execute(
+                "UPDATE job_items SET status = 'running', attempts = attempts + 1 WHERE rowid = ?",
+                (row["rowid"],),
+            )
+        conn.execute("COMMIT")
+        return row
+
+
+def _finish_item(job_id: str, idx: int, status: str, result: Optional[str], error: Optional[str]) -> None:
+    with contextlib.closing(_connect()) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "UPDATE job_items SET status = ?, result = ?, error = ? WHERE job_id = ? AND idx = ?",
+            (status, result, error, job_id, idx),
+        )
+        conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (time.time(), job_id))
+        conn.execute("COMMIT")
+
+
+def _retry_item(job_id: str, idx: int, delay: float) -> None:
+    """Queue a failed item again, not to be claimed for delay seconds."""
+    now = time.time()
+    with contextlib.closing(_connect()) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "UPDATE job_items SET status = 'queued', not_before = ? WHERE job_id = ? AND idx = ?",
+            (now + delay, job_id, idx),
+        )
+        conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (now, job_id))
+        conn.execute("COMMIT")
+
+
+def _requeue_item(job_id: str, idx: int) -> None:
+    """Put an item back without counting the attempt (it was shed, not failed)."""
+    with contextlib.closing(_connect()) as conn:
+        conn.execute(
+            "UPDATE job_items SET status = 'queued', attempts = attempts - 1 WHERE job_id = ? AND idx = ?",
+            (job_id, idx),
+        )
+
+
+def _read_job(job_id: str, offset: int, limit: int) -> Optional[dict[str, Any]]:
+    with contextlib.closing(_connect()) as conn:
+        job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if job is None:
+            return None
+        counts = dict(
+            conn.execute(
+                "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall()
+        )
+        items = conn.execute(
+            "SELECT idx, address, radius_km, status, result, error FROM job_items "
+            "WHERE job_id = ? ORDER BY idx LIMIT ? OFFSET ?",
+            (job_id, limit, offset),
+        ).fetchall()
+    queued, running = counts.get("queued", 0), counts.get("running", 0)
+    if queued + running == 0:
+        status = "completed"
+    elif queued == job["total"]:
+        status = "queued"
+    else:
+        status = "running"
+    return {
+        "job_id": job["id"],
+        "status": status,
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "total": job["total"],
+        "queued": queued,
+        "running": running,
+        "done": counts.get("done", 0),
+        "failed": counts.get("failed", 0),
+        "offset": offset,
+        "limit": limit,
+        "items": [
+            {
+                "index": r["idx"],
+                "address": r["address"],
+                "radius_km": r["radius_km"],
+                "status": r["status"],
+                "result": r["result"],
+                "error": r["error"],
+            }
+            for r in items
+        ],
+    }
+
+
+async def submit_job(items: list[tuple[str, float]]) -> str:
+    """Persist a job of (address, radius_km) items and wake the workers. Returns the job id."""
+    job_id = await asyncio.to_thread(_insert_job, items)
+    if _wakeup is not None:
+        _wakeup.set()
+    return job_id
+
+
+async def get_job(job_id: str, offset: int = 0, limit: int = 20) -> Optional[dict[str, Any]]:
+    """Job status with one page of items; item results are JSON strings of PropertyProfileResponse."""
+    return await asyncio.to_thread(_read_job, job_id, offset, limit)
+
+
+async def _run_item(row: sqlite3.Row) -> None:
+    job_id, idx = row["job_id"], row["idx"]
+    try:
+        profile = await build_property_profile(row["address"], radius_km=row["radius_km"])
+    except Overloaded as e:
+        await asyncio.sleep(e.retry_after)
+        await asyncio.to_thread(_requeue_item, job_id, idx)
+        return
+    except Exception as e:
+        if row["attempts"] + 1 < MAX_ATTEMPTS:
+            delay = RETRY_BACKOFF * 2 ** row["attempts"]
+            logger.info("Job %s item %d failed (will retry in %.0fs): %s", job_id, idx, delay, e)
+            await asyncio.to_thread(_retry_item, job_id, idx, delay)
+        else:
+            logger.warning("Job %s item %d failed: %s", job_id, idx, e)
+            await asyncio.to_thread(_finish_item, job_id, idx, "failed", None, str(e) or type(e).__name__)
+        return
+    if profile is None:
+        await asyncio.to_thread(
+            _finish_item, job_id, idx, "failed", None, "Address could not be geocoded."
+        )
+        return
+    await asyncio.to_thread(_finish_item, job_id, idx, "done", profile.model_dump_json(), None)
+
+
+async def _worker(limiter: RateLimiter) -> None:
+    """
+    Claim and run items until cancelled. A queue error (locked or full database) is logged and
+    retried after an exponential backoff instead of ending the worker; the item being finished,
+    if any, is put back in the queue.
+    """
+    set_priority(BATCH)
+    backoff = ERROR_BACKOFF
+    while True:
+        row = None
+        try:
+            row = await asyncio.to_thread(_claim_next)
+            if row is None:
+                _wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(_wakeup.wait(), IDLE_POLL)
+                continue
+            await limiter.wait()
+            await _run_item(row)
+            backoff = ERROR_BACKOFF
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Job worker error; retrying in %.1fs", backoff)
+            if row is not None:
+                try:
+                    await asyncio.to_thread(_requeue_item, row["job_id"], row["idx"])
+                except Exception as e:
+                    logger.warning("Could not requeue job %s item %d: %s", row["job_id"], row["idx"], e)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_ERROR_BACKOFF)
+
+
+async def start_workers() -> None:
+    global _wakeup
+    await asyncio.to_thread(init_db)
+    _wakeup = asyncio.Event()
+    limiter = RateLimiter(JOB_MIN_INTERVAL)
+    _workers.extend(asyncio.create_task(_worker(limiter)) for _ in range(max(1, JOB_WORKERS)))
+
+
+async def stop_workers() -> None:
+    """Cancel workers; items they were running are requeued by init_db on next start."""
+    for task in _workers:
+        task.cancel()
+    for task in _workers:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    _workers.clear()
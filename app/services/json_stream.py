@@ -0,0 +1,105 @@
+"""Incremental JSON parsing: yield the items of one top-level array while the body is still streaming."""
+import json
+import re
+from typing import Any, AsyncIterator, Optional
+
+_SPECIAL = re.compile(rb'[\[\]{}"]')
+_STRING_TAIL = re.compile(rb'(?:[^"\\]|\\.)*"', re.S)
+_NEXT_ITEM = re.compile(rb"[^\s,]")
+MAX_TRAILER = 1 << 20  # bytes of the object after the array that are read into `trailer`
+
+
+def _parse_trailer(rest: bytes) -> dict[str, Any]:
+    """Members of the top-level object that follow the array: b', "remark": "..."}' -> {"remark": "..."}."""
+    rest = rest.strip()
+    if rest.startswith(b","):
+        return json.loads(b"{" + rest[1:])
+    if rest != b"}":
+        raise ValueError("malformed JSON after the streamed array")
+    return {}
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[bytes],
+    key: str,
+    trailer: Optional[dict[str, Any]] = None,
+) -> AsyncIterator[Any]:
+    """
+    Yield each item of the array stored under top-level `key` (e.g. Overpass "elements",
+    ArcGIS "features") as soon as its bytes have arrived. Only one item is buffered at a time;
+    everything outside the array is scanned without being decoded. Items must be objects or arrays.
+    Stop iterating (and close the response) to abandon the rest of the body.
+
+    If `trailer` is given and the array is read to its end, the rest of the body is read too and
+    the top-level members after the array (e.g. Overpass "remark") are stored in it.
+    """
+    key_b = key.encode()
+    buf = bytearray()
+    pos = 0
+    depth = 0
+    last_str = None  # last string seen at depth 1; the key when a '[' follows it
+    in_array = False
+    item_start = -1
+    item_depth = 0
+    async for chunk in chunks:
+        buf += chunk
+        while True:
+            if in_array and item_start < 0:
+                m = _NEXT_ITEM.search(buf, pos)
+                if m is None:
+                    pos = len(buf)
+                    break
+                pos = m.start()
+                c = buf[pos]
+                if c == 0x5D:  # ]
+                    if trailer is not None:
+                        await _read_trailer(chunks, bytes(buf[pos + 1:]), trailer)
+                    return
+                if c not in (0x7B, 0x5B):  # { [
+                    raise ValueError(f"unsupported scalar item in {key!r} array")
+                item_start, item_depth = pos, depth
+                depth += 1
+                pos += 1
+                continue
+            m = _SPECIAL.search(buf, pos)
+            if m is None:
+                pos = len(buf)
+                break
+            c = buf[m.start()]
+            if c == 0x22:  # "
+                tail = _STRING_TAIL.match(buf, m.start() + 1)
+                if tail is None:
+                    pos = m.start()  # string continues in the next chunk
+                    break
+                if not in_array and depth == 1:
+                    last_str = bytes(buf[m.start() + 1:tail.end() - 1])
+                pos = tail.end()
+                continue
+            pos = m.end()
+            if c in (0x7B, 0x5B):
+                if not in_array and depth == 1 and c == 0x5B and last_str == key_b:
+                    in_array = True
+                depth += 1
+                continue
+            depth -= 1
+            if in_array and item_start >= 0 and depth == item_depth:
+                yield json.loads(bytes(buf[item_start:pos]))
+                item_start = -1
+                del buf[:pos]
+                pos = 0
+        # Drop what has been scanned; keep the partial item (or string) in progress
+        keep_from = item_start if item_start >= 0 else pos
+        if keep_from:
+            del buf[:keep_from]
+            pos -= keep_from
+            if item_start >= 0:
+                item_start = 0
+
+
+async def _read_trailer(chunks: AsyncIterator[bytes], rest: bytes, trailer: dict[str, Any]) -> None:
+    tail = bytearray(rest)
+    async for chunk in chunks:
+        tail += chunk
+        if len(tail) > MAX_TRAILER:
+            raise ValueError("too much JSON after the streamed array")
+    trailer.update(_parse_trailer(bytes(tail)))
@@ -1,17 +1,22 @@
 """Local news by area (city/state) via NewsCatcher. Tries Local News API first; on 401, falls back to main v3 API."""
 import logging
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import httpx
 
-from app.config import NEWSCATCHER_API_KEY
+from app.config import NEWSCATCHER_API_KEY, NEWSCATCHER_LOCAL_URL, NEWSCATCHER_URL
+from app.services import cache
+from app.services.http import get_client
 
 logger = logging.getLogger(__name__)
 
-LOCAL_NEWS_URL = "https://local-news.newscatcherapi.com/api/search"
-MAIN_API_URL = "https://v3-api.newscatcherapi.com/api/search"
+LOCAL_NEWS_URL = NEWSCATCHER_LOCAL_URL
+MAIN_API_URL = NEWSCATCHER_URL
 TIMEOUT = 15.0
 MAX_ARTICLES = 10
+CACHE_TTL = 3600
+WINDOW_DAYS = 7  # "local news" means published within this window, including merged cached articles
 
 
 def _normalize_articles(data: dict) -> list[dict]:
@@ -29,14 +34,18 @@ def _normalize_articles(data: dict) -> list[dict]:
     ]
 
 
-async def _fetch_local_news_api(client: httpx.AsyncClient, location_str: str) -> tuple[Optional[dict], Optional[int]]:
+async def _fetch_local_news_api(
+    client: httpx.AsyncClient,
+    location_str: str,
+    since: Optional[str] = None,
+) -> tuple[Optional[dict], Optional[int]]:
     """Try Local News API. Returns (data, status_code)."""
     payload = {
         "q": "*",
         "locations": [location_str],
         "detection_methods": ["local_section", "ai_extracted"],
         "lang": "en",
-        "from_": "7 days ago",
+        "from_": since or f"{WINDOW_DAYS} days ago",
         "page_size": MAX_ARTICLES,
     }
     headers = {
@@ -44,7 +53,7 @@ async def _fetch_local_news_api(client: httpx.AsyncClient, location_str: str) ->
         "Content-Type": "application/json",
     }
     try:
-        resp = await client.post(LOCAL_NEWS_URL, json=payload, headers=headers)
+        resp = await client.post(LOCAL_NEWS_URL, json=payload, headers=headers, timeout=TIMEOUT)
         if resp.status_code == 200:
             return resp.json(), resp.status_code
         return None, resp.status_code
@@ -53,13 +62,13 @@ async def _fetch_local_news_api(client: httpx.AsyncClient, location_str: str) ->
         return None, None
 
 
-async def _fetch_main_api(client: httpx.AsyncClient, location_str: str) -> list[dict]:
+async def _fetch_main_api(client: httpx.AsyncClient, location_str: str, since: Optional[str] = None) -> list[dict]:
     """Fallback: main NewsCatcher v3 API with location as search query (e.g. 'San Jose California')."""
     payload = {
         "q": location_str,
         "lang": "en",
         "countries": "US",
-        "from_": "7 days ago",
+        "from_": since or f"{WINDOW_DAYS} days ago",
         "page_size": MAX_ARTICLES,
     }
     headers = {
@@ -67,7 +76,7 @@ async def _fetch_main_api(client: httpx.AsyncClient, location_str: str) -> list[
         "Content-Type": "application/json",
     }
     try:
-        resp = await client.post(MAIN_API_URL, json=payload, headers=headers)
+        resp = await client.post(MAIN_API_URL, json=payload, headers=headers, timeout=TIMEOUT)
         resp.raise_for_status()
         return _normalize_articles(resp.json())
     except Exception as e:
@@ -78,12 +87,15 @@ async def _fetch_main_api(client: httpx.AsyncClient, location_str: str) -> list[
 async def get_local_news(
     city: Optional[str] = None,
     state: Optional[str] = None,
+    refresh_within: float = 0.0,
 ) -> list[dict]:
     """
     Fetch local news for the given area. Tries Local News API first.
     If that returns 401 (key not authorized for Local News), falls back to main v3 API
     using city/state as search query so the same key still returns location-relevant news.
-    Returns list of {title, url, source, published_date}.
+    Returns list of {title, url, source, published_date}. Non-empty results are cached per area;
+    when they expire, only articles newer than the latest cached one (and within WINDOW_DAYS) are
+    fetched and merged in, and cached articles older than WINDOW_DAYS are dropped.
     """
     if not NEWSCATCHER_API_KEY or not NEWSCATCHER_API_KEY.strip():
         return []
@@ -97,19 +109,62 @@ async def get_local_news(
         return []
 
     location_str = ", ".join(location_parts)
+    key = location_str.lower()
+    cached = cache.get_cached("news", key, refresh_within)
+    if cached is not None:
+        return cached
+
+    stale, _ = cache.get_stale("news", key) or (None, {})
+    cutoff = _window_start()
+    recent = [a for a in stale if (a.get("published_date") or "") >= cutoff] if stale else []
+    since = _latest_published(recent) if recent else None
+    articles = [
+        a for a in await _fetch_news(location_str, since)
+        if not a.get("published_date") or a["published_date"] >= cutoff
+    ]
+    if since is not None:
+        if not articles:
+            # Nothing newer (or the refresh failed): keep the cached articles still inside the window
+            cache.set_cached("news", key, recent, CACHE_TTL)
+            return recent
+        articles = _merge_articles(articles, recent)
+    if articles:
+        cache.set_cached("news", key, articles, CACHE_TTL)
+    return articles
+
+
+def _window_start() -> str:
+    """Oldest published_date still served, in NewsCatcher's "YYYY-MM-DD HH:MM:SS" (UTC) format."""
+    return (datetime.now(timezone.utc) - timedelta(days=WINDOW_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _latest_published(articles: list[dict]) -> Optional[str]:
+    dates = [a["published_date"] for a in articles if a.get("published_date")]
+    return max(dates) if dates else None
+
+
+def _merge_articles(new: list[dict], old: list[dict]) -> list[dict]:
+    """Newest first, de-duplicated by URL, capped at MAX_ARTICLES."""
+    merged = {a["url"]: a for a in old}
+    merged.update((a["url"], a) for a in new)
+    ordered = sorted(merged.values(), key=lambda a: a.get("published_date") or "", reverse=True)
+    return ordered[:MAX_ARTICLES]
+
 
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        data, status = await _fetch_local_news_api(client, location_str)
+async def _fetch_news(location_str: str, since: Optional[str] = None) -> list[dict]:
+    """Articles from the last 7 days, or only those published after since (a cached published_date)."""
+    client = get_client()
+    data, status = await _fetch_local_news_api(client, location_str, since)
 
-        if data is not None and status == 200:
-            return _normalize_articles(data)
+    if data is not None and status == 200:
+        return _normalize_articles(data)
 
-        if status == 401:
-            logger.info(
-                "NewsCatcher Local News API returned 401 (this key does not have Local News access). "
-                "Using main News API with location search instead."
-            )
-        elif status is not None:
-            logger.warning("Local news fetch failed for %s: HTTP %s. Trying main API.", location_str, status)
+    if status == 401:
+        logger.info(
+            "NewsCatcher Local News API returned 401 (this key does not have Local News access). "
+            "Using main News API with location search instead."
+        )
+    elif status is not None:
+        logger.warning("Local news fetch failed for %s: HTTP %s. Trying main API.", location_str, status)
 
-        return await _fetch_main_api(client, location_str)
+    return await _fetch_main_api(client, location_str, since)
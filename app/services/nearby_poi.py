@@ -1,31 +1,44 @@
 """Nearby POI (food, gym, grocery, malls) via Overpass API (OpenStreetMap). No API key."""
-import json
+import bisect
+import contextlib
+import functools
 import logging
-from typing import Any, Optional
+from typing import Optional
 
 import httpx
 
+from app.services import cache
+from app.services.geo_utils import haversine_km
+from app.services.json_stream import iter_json_array
+from app.services.overpass import OverpassError, run_query
+from app.services.records import PlaceRecord
+
 logger = logging.getLogger(__name__)
 
-OVERPASS_URL = "https://overpass-api.de/api/interpreter"
-TIMEOUT = 45.0  # Overpass can be slow; 504s are common under load
 MAX_RADIUS_M = 10_000  # 10 km
 DEFAULT_RADIUS_M = 2_000  # 2 km
+CACHE_TTL = 24 * 3600
+MAX_PLACES = 100  # cap for response size
+MAX_AREA_PLACES = 2_000  # cap for shared area queries (bbox split per address, neighbourhood stats)
 
 
 def _build_query(lat: float, lon: float, radius_m: int) -> str:
     # Query nodes and ways for amenity and shop tags (Overpass: tag filter then (around:radius,lat,lon))
+    return _query_for_filter(f"around:{radius_m},{lat},{lon}")
+
+
+def _query_for_filter(spatial: str) -> str:
     return f"""[out:json][timeout:40];
 (
-  node["amenity"~"^(restaurant|cafe|fast_food|gym)$"](around:{radius_m},{lat},{lon});
-  way["amenity"~"^(restaurant|cafe|fast_food|gym)$"](around:{radius_m},{lat},{lon});
-  node["shop"~"^(supermarket|mall|convenience)$"](around:{radius_m},{lat},{lon});
-  way["shop"~"^(supermarket|mall|convenience)$"](around:{radius_m},{lat},{lon});
+  node["amenity"~"^(restaurant|cafe|fast_food|gym)$"]({spatial});
+  way["amenity"~"^(restaurant|cafe|fast_food|gym)$"]({spatial});
+  node["shop"~"^(supermarket|mall|convenience)$"]({spatial});
+  way["shop"~"^(supermarket|mall|convenience)$"]({spatial});
 );
 out center;"""
 
 
-def _element_to_place(el: dict) -> Optional[dict]:
+def _element_to_place(el: dict) -> Optional[PlaceRecord]:
     tags = el.get("tags") or {}
     name = tags.get("name") or tags.get("brand") or "Unnamed"
     lat = el.get("lat")
@@ -47,58 +60,132 @@ def _element_to_place(el: dict) -> Optional[dict]:
         tags.get("addr:postcode"),
     ]
     address = " ".join(str(p) for p in address_parts if p) or None
-    return {
-        "name": name,
-        "lat": lat,
-        "lon": lon,
-        "category": category,
-        "address": address,
-    }
+    return PlaceRecord(name=name, lat=lat, lon=lon, category=category, address=address)
+
+
+def _location_key(lat: float, lon: float) -> str:
+    return f"{lat:.4f},{lon:.4f}"
+
+
+def _from_entry(entry: dict, radius_m: int, limit: int) -> Optional[list[PlaceRecord]]:
+    """
+    Places within radius_m from a cached fetch (sorted by distance), or None if the entry cannot
+    answer: it covers a smaller radius, or it was truncated and radius_m/limit differ from the fetch.
+    """
+    if entry["radius_m"] < radius_m:
+        return None
+    if entry["truncated"] and (entry["radius_m"] != radius_m or entry["limit"] < limit):
+        return None  # a truncated fetch is an arbitrary subset; nearer places may be missing
+    end = bisect.bisect_right(entry["dist_km"], radius_m / 1000)
+    return entry["places"][:min(end, limit)]
 
 
 async def get_nearby_poi(
     lat: float,
     lon: float,
     radius_km: float = 2.0,
-) -> list[dict[str, Any]]:
+    refresh_within: float = 0.0,
+    limit: int = MAX_PLACES,
+) -> list[PlaceRecord]:
     """
     Fetch nearby POI (restaurants, cafes, gyms, supermarkets, malls) from OpenStreetMap.
-    Returns list of {name, lat, lon, category, address?}.
+    Returns up to limit PlaceRecords (name, lat, lon, category, address?), nearest first; callers
+    that need the full area (e.g. neighbourhood stats) pass a larger limit and cap afterwards.
+    Results are cached per location at the largest radius fetched so far, so a smaller radius
+    is answered by filtering locally. Non-empty results are cached for CACHE_TTL.
     """
     radius_m = min(max(int(radius_km * 1000), 500), MAX_RADIUS_M)
+    loc = _location_key(lat, lon)
+    exact_key = f"{loc},{radius_m}"
+    for key in (loc, exact_key):
+        entry = cache.get_cached("poi", key, refresh_within)
+        if entry is not None:
+            places = _from_entry(entry, radius_m, limit)
+            if places is not None:
+                return places
     query = _build_query(lat, lon, radius_m)
-    last_error = None
-    for attempt in range(2):  # initial + one retry
-        try:
-            async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                resp = await client.post(
-                    OVERPASS_URL,
-                    content=query,
-                    headers={"Content-Type": "text/plain"},
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                break
-        except (httpx.HTTPError, json.JSONDecodeError) as e:
-            last_error = e
-            resp = getattr(e, "response", None)
-            status = getattr(resp, "status_code", None) if resp is not None else None
-            retryable = status in (502, 503, 504) or isinstance(e, httpx.TimeoutException)
-            if retryable and attempt == 0:
-                logger.info("Nearby POI attempt 1 failed (will retry): %s", e)
-                continue
-            logger.warning("Nearby POI fetch failed for %.4f,%.4f: %s", lat, lon, last_error)
-            return []
-    elements = data.get("elements") or []
+    fetched = await _fetch_places(query, limit)
+    if fetched is None:
+        logger.warning("Nearby POI fetch failed for %.4f,%.4f", lat, lon)
+        return []
+    if not fetched:
+        return []  # an empty answer may be a transient upstream hiccup; don't pin it for CACHE_TTL
+    dist = [haversine_km(lat, lon, p.lat, p.lon) for p in fetched]
+    order = sorted(range(len(fetched)), key=dist.__getitem__)
+    entry = {
+        "radius_m": radius_m,
+        "limit": limit,
+        "truncated": len(fetched) >= limit,
+        "places": [fetched[i] for i in order],
+        "dist_km": [dist[i] for i in order],
+    }
+    # The location entry keeps the widest complete fetch; anything else is cached for its exact radius
+    widest = cache.get_cached("poi", loc)
+    if widest is None or (radius_m >= widest["radius_m"] and not (entry["truncated"] and not widest["truncated"])):
+        cache.set_cached("poi", loc, entry, CACHE_TTL)
+    else:
+        cache.set_cached("poi", exact_key, entry, CACHE_TTL)
+    return entry["places"]
+
+
+async def get_pois_in_bbox(
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    limit: int = MAX_AREA_PLACES,
+) -> list[PlaceRecord]:
+    """Same POI categories inside a bounding box (one query shared by several nearby addresses)."""
+    key = f"bbox:{south:.4f},{west:.4f},{north:.4f},{east:.4f},{limit}"
+    cached = cache.get_cached("poi", key)
+    if cached is not None:
+        return cached
+    out = await _fetch_places(_query_for_filter(f"{south},{west},{north},{east}"), limit)
+    if out is None:
+        logger.warning("Nearby POI fetch failed for bbox %.4f,%.4f,%.4f,%.4f", south, west, north, east)
+        return []
+    if out:
+        cache.set_cached("poi", key, out, CACHE_TTL)
+    return out
+
+
+async def _collect_places(resp: httpx.Response, limit: int) -> Optional[list[PlaceRecord]]:
+    """
+    Convert elements as they stream in; stop reading once limit distinct places are collected.
+    A body that ends with a "remark" (Overpass's runtime error / timeout report) holds a partial
+    result and yields None, so it is not cached as a complete one.
+    """
     seen = set()
     out = []
-    for el in elements:
-        place = _element_to_place(el)
-        if not place:
-            continue
-        key = (place["lat"], place["lon"], place["name"])
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append(place)
-    return out[:100]  # cap for response size
+    trailer: dict = {}
+    elements = iter_json_array(resp.aiter_bytes(), "elements", trailer)
+    async with contextlib.aclosing(elements):
+        async for el in elements:
+            place = _element_to_place(el)
+            if not place:
+                continue
+            dedupe_key = (place.lat, place.lon, place.name)
+            if dedupe_key in seen:
+                continue
+            seen.add(dedupe_key)
+            out.append(place)
+            if len(out) >= limit:
+                break
+    if trailer.get("remark") or trailer.get("error"):
+        logger.warning(
+            "Overpass returned a partial result (%d places): %s", len(out), trailer.get("remark") or trailer.get("error")
+        )
+        return None
+    return out
+
+
+async def _fetch_places(query: str, limit: int) -> Optional[list[PlaceRecord]]:
+    """
+    Run an Overpass query (hedged across mirrors) and return up to limit distinct places, or None on failure.
+    The response is parsed incrementally and the connection is closed as soon as limit is reached.
+    """
+    try:
+        return await run_query(query, functools.partial(_collect_places, limit=limit))
+    except (OverpassError, ValueError) as e:
+        logger.debug("Overpass query failed: %s", e)
+        return None
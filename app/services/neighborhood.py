@@ -0,0 +1,130 @@
+"""Neighbourhood amenity stats: ring counts, nearest distances and a composite score in one NumPy pass."""
+from typing import TYPE_CHECKING, Any, Optional
+
+from app.services import cache
+from app.services.geo_utils import EARTH_RADIUS_KM, geohash_center, geohash_encode
+from app.services.nearby_poi import MAX_AREA_PLACES
+from app.services.records import PlaceRecord, SchoolRecord
+
+RINGS_KM = (0.5, 1.0, 2.0, 5.0)
+GEOHASH_PRECISION = 7  # ~150 m cells: nearby addresses share one computation
+CACHE_TTL = 24 * 3600  # same lifetime as the POI data it is built from
+SCHOOL = "school"
+
+if TYPE_CHECKING:
+    import numpy as np  # imported on first compute (preloaded in the background at startup)
+
+# Composite score: group -> (categories, weight, target count within TARGET_RING_KM, distance decay km)
+SCORE_GROUPS = {
+    "groceries": (("supermarket", "convenience"), 0.3, 3, 1.0),
+    "food": (("restaurant", "cafe", "fast_food"), 0.25, 15, 0.5),
+    "fitness": (("gym",), 0.1, 2, 1.5),
+    "shopping": (("mall",), 0.1, 1, 3.0),
+    "schools": ((SCHOOL,), 0.25, 3, 1.5),
+}
+TARGET_RING_KM = 1.0
+
+
+def _haversine_km(lat: float, lon: float, lats: "np.ndarray", lons: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    p1 = np.radians(lat)
+    p2 = np.radians(lats)
+    a = np.sin((p2 - p1) / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(np.radians(lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def compute_stats(
+    lat: float,
+    lon: float,
+    poi: list[PlaceRecord],
+    schools: list[SchoolRecord],
+    poi_radius_km: float,
+) -> dict[str, Any]:
+    """
+    Per-category counts in each ring, nearest distance per category, and a 0-100 amenity score.
+    All points (POI and schools, before any response cap) go through one vectorized distance and
+    histogram pass. POI rings wider than poi_radius_km are reported as None (not covered by the query).
+    """
+    import numpy as np
+
+    schools = [s for s in schools if s.lat is not None and s.lon is not None]
+    categories = sorted({p.category for p in poi} | ({SCHOOL} if schools else set()))
+    code = {c: i for i, c in enumerate(categories)}
+    lats = np.fromiter((p.lat for p in poi), float, len(poi))
+    lons = np.fromiter((p.lon for p in poi), float, len(poi))
+    cats = np.fromiter((code[p.category] for p in poi), np.intp, len(poi))
+    if schools:
+        lats = np.concatenate([lats, np.fromiter((s.lat for s in schools), float, len(schools))])
+        lons = np.concatenate([lons, np.fromiter((s.lon for s in schools), float, len(schools))])
+        cats = np.concatenate([cats, np.full(len(schools), code[SCHOOL], np.intp)])
+
+    rings = np.asarray(RINGS_KM)
+    n_cat, n_ring = len(categories), len(rings)
+    dist = _haversine_km(lat, lon, lats, lons)
+    # Innermost ring containing each point (n_ring = outside all rings), then a 2-D histogram
+    ring_idx = np.searchsorted(rings, dist, side="left")
+    hist = np.bincount(cats * (n_ring + 1) + ring_idx, minlength=n_cat * (n_ring + 1))
+    counts = hist.reshape(n_cat, n_ring + 1)[:, :n_ring].cumsum(axis=1)
+    nearest = np.full(n_cat, np.inf)
+    np.minimum.at(nearest, cats, dist)
+
+    ring_stats = []
+    for r, radius in enumerate(RINGS_KM):
+        poi_covered = radius <= poi_radius_km + 1e-9
+        ring_stats.append({
+            "radius_km": radius,
+            "counts": {
+                c: int(counts[i, r]) for i, c in enumerate(categories) if c != SCHOOL
+            } if poi_covered else None,
+            "schools": int(counts[code[SCHOOL], r]) if schools else 0,
+        })
+    nearest_km = {c: round(float(nearest[i]), 3) for i, c in enumerate(categories) if np.isfinite(nearest[i])}
+
+    target_ring = RINGS_KM.index(TARGET_RING_KM)
+    score = 0.0
+    for members, weight, target, decay in SCORE_GROUPS.values():
+        idx = [code[c] for c in members if c in code]
+        if not idx:
+            continue
+        count = int(counts[idx, target_ring].sum())
+        closest = float(nearest[idx].min())
+        group = 0.5 * min(1.0, count / target) + 0.5 * float(np.exp(-closest / decay))
+        score += weight * group
+
+    return {
+        "poi_radius_km": poi_radius_km,
+        "rings": ring_stats,
+        "nearest_km": nearest_km,
+        "amenity_score": round(100 * score, 1),
+    }
+
+
+def cell_for(lat: float, lon: float) -> str:
+    return geohash_encode(lat, lon, GEOHASH_PRECISION)
+
+
+def get_cached_stats(lat: float, lon: float, poi_radius_km: float) -> Optional[dict[str, Any]]:
+    return cache.get_cached("neighborhood_stats", f"{cell_for(lat, lon)}:{poi_radius_km:g}")
+
+
+def stats_for_cell(
+    lat: float,
+    lon: float,
+    poi: list[PlaceRecord],
+    schools: list[SchoolRecord],
+    poi_radius_km: float,
+) -> dict[str, Any]:
+    """
+    Compute stats around the centre of (lat, lon)'s geohash cell and cache them for the cell.
+    poi that hit MAX_AREA_PLACES is an arbitrary subset of the radius (Overpass returns id order,
+    not distance order): such stats are marked complete=False and not cached.
+    """
+    cell = cell_for(lat, lon)
+    center_lat, center_lon = geohash_center(cell)
+    stats = compute_stats(center_lat, center_lon, poi, schools, poi_radius_km)
+    stats["geohash"] = cell
+    stats["complete"] = len(poi) < MAX_AREA_PLACES
+    if stats["complete"]:
+        cache.set_cached("neighborhood_stats", f"{cell}:{poi_radius_km:g}", stats, CACHE_TTL)
+    return stats
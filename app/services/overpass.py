@@ -0,0 +1,158 @@
+"""Overpass API client: several mirrors, health/latency tracking, hedged requests."""
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+from app.config import OVERPASS_URLS
+from app.services.http import get_client
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT = 45.0  # per attempt; Overpass can be slow and 504s are common under load
+MIN_HEDGE_DELAY = 1.0
+MAX_HEDGE_DELAY = 15.0
+DEFAULT_LATENCY = 3.0  # assumed until an endpoint has samples
+LATENCY_SAMPLES = 50
+BASE_COOLDOWN = 30.0
+MAX_COOLDOWN = 600.0
+
+T = TypeVar("T")
+
+
+class OverpassError(Exception):
+    """Every endpoint attempt failed."""
+
+
+class _Endpoint:
+    def __init__(self, url: str):
+        self.url = url
+        self.latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.failures = 0  # consecutive
+        self.down_until = 0.0
+
+    def quantile(self, q: float) -> float:
+        if not self.latencies:
+            return DEFAULT_LATENCY
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def score(self) -> float:
+        """Expected latency, penalized by recent failures; lower is better."""
+        return self.quantile(0.5) * (1 + self.failures)
+
+    def record_success(self, elapsed: float) -> None:
+        self.latencies.append(elapsed)
+        self.failures = 0
+        self.down_until = 0.0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.down_until = time.monotonic() + min(BASE_COOLDOWN * 2 ** (self.failures - 1), MAX_COOLDOWN)
+
+
+_endpoints = [_Endpoint(url) for url in OVERPASS_URLS]
+
+
+def endpoint_health() -> list[dict]:
+    """Snapshot of per-mirror latency and failure state (for logs/diagnostics)."""
+    now = time.monotonic()
+    return [
+        {
+            "url": ep.url,
+            "p50_s": round(ep.quantile(0.5), 3),
+            "p95_s": round(ep.quantile(0.95), 3),
+            "samples": len(ep.latencies),
+            "consecutive_failures": ep.failures,
+            "cooling_down_s": round(max(0.0, ep.down_until - now), 1),
+        }
+        for ep in _endpoints
+    ]
+
+
+def _ranked() -> list[_Endpoint]:
+    now = time.monotonic()
+    healthy = sorted((ep for ep in _endpoints if ep.down_until <= now), key=_Endpoint.score)
+    cooling = sorted((ep for ep in _endpoints if ep.down_until > now), key=lambda ep: ep.down_until)
+    order = healthy + cooling
+    if len(order) == 1:
+        order = order * 2  # single mirror: keep the old one-retry behaviour
+    return order
+
+
+def _hedge_delay(ep: _Endpoint) -> float:
+    return min(max(ep.quantile(0.95), MIN_HEDGE_DELAY), MAX_HEDGE_DELAY)
+
+
+async def _attempt(
+    ep: _Endpoint,
+    query: str,
+    handle: Callable[[httpx.Response], Awaitable[T]],
+) -> T:
+    start = time.monotonic()
+    try:
+        async with get_client().stream(
+            "POST", ep.url, content=query, headers={"Content-Type": "text/plain"}, timeout=TIMEOUT
+        ) as resp:
+            resp.raise_for_status()
+            result = await handle(resp)
+    except asyncio.CancelledError:
+        # Lost the race. The elapsed time is only a lower bound on this mirror's latency, so it is
+        # kept only when it already exceeds the mirror's median (pushing a slow mirror down the
+        # ranking); a loser cancelled early says nothing and must not look fast.
+        elapsed = time.monotonic() - start
+        if elapsed > ep.quantile(0.5):
+            ep.latencies.append(elapsed)
+        raise
+    except Exception:
+        ep.record_failure()
+        raise
+    ep.record_success(time.monotonic() - start)
+    return result
+
+
+async def run_query(query: str, handle: Callable[[httpx.Response], Awaitable[T]]) -> T:
+    """
+    Run an Overpass query against the best mirror. If it has not finished within its p95 latency
+    (clamped to MIN/MAX_HEDGE_DELAY), the next mirror gets the same query; a failure starts the next
+    one immediately. The first successful `handle(response)` wins and the others are cancelled.
+    """
+    candidates = _ranked()
+    pending: dict[asyncio.Task, _Endpoint] = {}
+    last_error: Optional[BaseException] = None
+    launch_next = True
+    try:
+        while True:
+            if launch_next and candidates:
+                ep = candidates.pop(0)
+                pending[asyncio.create_task(_attempt(ep, query, handle))] = ep
+                hedge_after = _hedge_delay(ep)
+            launch_next = False
+            if not pending:
+                break
+            can_hedge = bool(candidates) and candidates[0] not in pending.values()
+            done, _ = await asyncio.wait(
+                pending, timeout=hedge_after if can_hedge else None, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                logger.debug("Overpass hedging after %.1fs: adding %s", hedge_after, candidates[0].url)
+                launch_next = True
+                continue
+            for task in done:
+                ep = pending.pop(task)
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+                logger.info("Overpass endpoint %s failed: %s", ep.url, last_error)
+                launch_next = True
+    finally:
+        for task in pending:
+            task.cancel()
+        for task in pending:
+            with contextlib.suppress(BaseException):
+                await task
+    raise OverpassError(str(last_error) if last_error else "no Overpass endpoints configured")
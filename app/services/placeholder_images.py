@@ -1,25 +1,37 @@
-"""Optional placeholder property image from Unsplash (generic, not the actual property)."""
+"""Optional placeholder property image from Unsplash (generic, not the actual property).
+
+Search results are cached per (property type, city) and the chosen image is stored locally and
+served from /api/images/{id}; Unsplash is only contacted in the background, within its hourly limit.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
 from typing import Optional
 
-import httpx
+from app.config import UNSPLASH_ACCESS_KEY, UNSPLASH_HOURLY_LIMIT
+from app.services import image_store
+from app.services.http import get_client
 
-from app.config import UNSPLASH_ACCESS_KEY
+logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.unsplash.com/search/photos"
 TIMEOUT = 10.0
+SEARCH_TTL = 30 * 24 * 3600
+MISS_RETRY_AFTER = 3600  # don't search again for a query that had no results for this long
+DEFAULT_WIDTH = 640
+DEFAULT_FORMAT = "webp"
+INDEX_PATH = image_store.IMAGES_DIR / "index.json"
 
+# query -> {"image_id": str | None, "fetched_at": float}
+_index: Optional[dict[str, dict]] = None
+_search_times: deque = deque()
+_in_flight: dict[str, asyncio.Task] = {}
 
-async def get_placeholder_image(
-    city: Optional[str] = None,
-    property_type: Optional[str] = None,
-) -> Optional[str]:
-    """
-    Return one generic image URL for UI placeholder. Not a photo of the actual property.
-    Requires UNSPLASH_ACCESS_KEY. Returns None if key unset or no result.
-    """
-    if not UNSPLASH_ACCESS_KEY or not UNSPLASH_ACCESS_KEY.strip():
-        return None
 
+def _build_query(city: Optional[str], property_type: Optional[str]) -> str:
     query_parts = []
     if property_type and property_type.strip():
         query_parts.append(property_type.strip().lower())
@@ -27,23 +39,108 @@ async def get_placeholder_image(
         query_parts.append("residential")
     if city and city.strip():
         query_parts.append(city.strip())
-    query = " ".join(query_parts) or "house"
+    return " ".join(query_parts) or "house"
+
+
+def _load_index() -> dict[str, dict]:
+    global _index
+    if _index is None:
+        try:
+            with open(INDEX_PATH) as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _save_index(index: dict) -> None:
+    """Write a snapshot of the index (taken on the event loop, so concurrent updates can't race the dump)."""
+    try:
+        INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = INDEX_PATH.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, INDEX_PATH)
+    except OSError as e:
+        logger.warning("Could not save image index: %s", e)
+
+
+def _take_search_slot() -> bool:
+    """Sliding one-hour window over Unsplash API calls."""
+    now = time.time()
+    while _search_times and now - _search_times[0] >= 3600:
+        _search_times.popleft()
+    if len(_search_times) >= UNSPLASH_HOURLY_LIMIT:
+        return False
+    _search_times.append(now)
+    return True
 
+
+def image_url(image_id: str, width: int = DEFAULT_WIDTH, fmt: str = DEFAULT_FORMAT) -> str:
+    return f"/api/images/{image_id}?w={width}&fmt={fmt}"
+
+
+async def _search_and_store(query: str) -> None:
+    if not _take_search_slot():
+        logger.info("Unsplash hourly limit reached; skipping search for %r", query)
+        return
     params = {
         "query": query,
         "client_id": UNSPLASH_ACCESS_KEY.strip(),
         "per_page": 1,
     }
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            resp = await client.get(BASE_URL, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-    except Exception:
-        return None
+        resp = await get_client().get(BASE_URL, params=params, timeout=TIMEOUT)
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as e:
+        logger.debug("Unsplash search failed for %r: %s", query, e)
+        return
 
+    image_id = None
     results = data.get("results") or []
-    if not results:
+    if results:
+        photo = results[0]
+        urls = photo.get("urls") or {}
+        source_url = urls.get("regular") or urls.get("small") or urls.get("full")
+        candidate = str(photo.get("id") or "")
+        if source_url and await image_store.download_image(candidate, source_url):
+            image_id = candidate
+    _load_index()[query] = {"image_id": image_id, "fetched_at": time.time()}
+    await asyncio.to_thread(_save_index, dict(_load_index()))
+
+
+def _schedule(query: str) -> None:
+    if query in _in_flight:
+        return
+    task = asyncio.get_running_loop().create_task(_search_and_store(query))
+    _in_flight[query] = task
+    task.add_done_callback(lambda _: _in_flight.pop(query, None))
+
+
+async def get_placeholder_image(
+    city: Optional[str] = None,
+    property_type: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Return a local URL (/api/images/...) for a generic placeholder image. Not a photo of the actual property.
+    Never waits on Unsplash: on a cache miss the search/download is scheduled in the background
+    and None is returned until the image is stored. Requires UNSPLASH_ACCESS_KEY.
+    """
+    if not UNSPLASH_ACCESS_KEY or not UNSPLASH_ACCESS_KEY.strip():
         return None
-    urls = results[0].get("urls") or {}
-    return urls.get("regular") or urls.get("small") or urls.get("full")
+
+    query = _build_query(city, property_type)
+    entry = _load_index().get(query)
+    now = time.time()
+    if entry is not None:
+        image_id = entry.get("image_id")
+        age = now - entry.get("fetched_at", 0)
+        if image_id and image_store.has_image(image_id):
+            if age >= SEARCH_TTL:
+                _schedule(query)  # serve the stored image while a fresh one is fetched
+            return image_url(image_id)
+        if not image_id and age < MISS_RETRY_AFTER:
+            return None
+    _schedule(query)
+    return None
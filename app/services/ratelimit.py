@@ -0,0 +1,19 @@
+"""Small asyncio rate limiter shared by background work (warm-up, jobs)."""
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Spaces out starts by at least min_interval seconds."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            delay = self._next - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next = time.monotonic() + self.min_interval
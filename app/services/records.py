@@ -0,0 +1,29 @@
+"""Internal records for schools and POI: slotted dataclasses passed from services to the API edge.
+
+Services build these once per upstream item; the distance, cache and stats layers read their
+attributes directly, and only the aggregator turns them into response models.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class SchoolRecord:
+    name: str
+    nces_id: Optional[str] = None
+    street: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    zip: Optional[str] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    lea_id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class PlaceRecord:
+    name: str
+    lat: float
+    lon: float
+    category: str
+    address: Optional[str] = None
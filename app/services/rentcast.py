@@ -4,32 +4,48 @@ from urllib.parse import quote
 
 import httpx
 
-from app.config import RENTCAST_API_KEY
+from app.config import RENTCAST_API_KEY, RENTCAST_BASE_URL
+from app.services import cache
+from app.services.http import get_client
 
-BASE_URL = "https://api.rentcast.io/v1"
+BASE_URL = RENTCAST_BASE_URL
 TIMEOUT = 15.0
+CACHE_TTL = 7 * 24 * 3600  # property records change rarely; refreshes are conditional
 
 
-async def get_property_by_address(address: str) -> Optional[dict]:
+async def get_property_by_address(address: str, refresh_within: float = 0.0) -> Optional[dict]:
     """
     Fetch property record by address.
-    Returns the first property dict if found, None if 404 or error.
+    Returns the first property dict if found, None if 404 or error. Found records are cached
+    for CACHE_TTL and revalidated with a conditional request when the upstream sent validators.
     """
     if not RENTCAST_API_KEY:
         return None
+    key = " ".join(address.lower().split())
+    cached = cache.get_cached("rentcast", key, refresh_within)
+    if cached is not None:
+        return cached
+    stale, validators = cache.get_stale("rentcast", key) or (None, {})
     url = f"{BASE_URL}/properties?address={quote(address)}"
     headers = {"X-Api-Key": RENTCAST_API_KEY, "Accept": "application/json"}
+    if stale is not None:
+        headers.update(cache.conditional_headers(validators))
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            resp = await client.get(url, headers=headers)
-            if resp.status_code == 404:
-                return None
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await get_client().get(url, headers=headers, timeout=TIMEOUT)
+        if resp.status_code == 304:
+            cache.extend("rentcast", key, CACHE_TTL)
+            return stale
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        data = resp.json()
         if isinstance(data, list) and data:
-            return data[0]
-        if isinstance(data, dict) and data.get("id"):
-            return data
-        return None
+            record = data[0]
+        elif isinstance(data, dict) and data.get("id"):
+            record = data
+        else:
+            return None
+        cache.set_cached("rentcast", key, record, CACHE_TTL, cache.validators_from(resp.headers))
+        return record
     except (httpx.HTTPError, Exception):
         return None
@@ -0,0 +1,118 @@
+"""Admission control: per-priority concurrency caps, deadline-bounded queues, load shedding."""
+import asyncio
+import contextlib
+import math
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+from app.config import (
+    BATCH_CONCURRENCY,
+    BATCH_QUEUE_BUDGET,
+    INTERACTIVE_CONCURRENCY,
+    INTERACTIVE_QUEUE_BUDGET,
+)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+INITIAL_SERVICE_TIME = 2.0  # seconds, until real samples arrive
+EWMA_ALPHA = 0.2
+
+
+class Overloaded(Exception):
+    """Queue wait would exceed the class's latency budget; surfaced as 429 with Retry-After."""
+
+    def __init__(self, priority: str, retry_after: float):
+        super().__init__(f"{priority} queue is full")
+        self.priority = priority
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class _PriorityClass:
+    def __init__(self, name: str, limit: int, budget: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.budget = budget
+        self.active = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.avg_service = INITIAL_SERVICE_TIME
+
+    def expected_wait(self) -> float:
+        """Rough wait for a newcomer: everyone queued ahead, served limit at a time."""
+        return (len(self.waiters) + 1) * self.avg_service / self.limit
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return
+        wait = self.expected_wait()
+        if wait > self.budget:
+            raise Overloaded(self.name, wait)
+        fut = asyncio.get_running_loop().create_future()
+        self.waiters.append(fut)
+        try:
+            await asyncio.wait_for(fut, timeout=self.budget)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if fut.done() and not fut.cancelled():
+                self.release()  # slot was handed over just as we gave up
+            else:
+                with contextlib.suppress(ValueError):
+                    self.waiters.remove(fut)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise Overloaded(self.name, self.expected_wait()) from None
+
+    def release(self) -> None:
+        while self.waiters:
+            fut = self.waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)  # hand the slot over; active count is unchanged
+                return
+        self.active -= 1
+
+    def observe(self, elapsed: float) -> None:
+        self.avg_service += EWMA_ALPHA * (elapsed - self.avg_service)
+
+
+_classes = {
+    INTERACTIVE: _PriorityClass(INTERACTIVE, INTERACTIVE_CONCURRENCY, INTERACTIVE_QUEUE_BUDGET),
+    BATCH: _PriorityClass(BATCH, BATCH_CONCURRENCY, BATCH_QUEUE_BUDGET),
+}
+
+_priority: ContextVar[str] = ContextVar("priority", default=INTERACTIVE)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+def set_priority(priority: str) -> None:
+    """Set the priority class for the current context (request or background task)."""
+    _priority.set(priority if priority in _classes else INTERACTIVE)
+
+
+@contextlib.asynccontextmanager
+async def admission(priority: Optional[str] = None) -> AsyncIterator[None]:
+    """Hold one slot of the priority class (current context's by default) for the block."""
+    cls = _classes[priority or _priority.get()]
+    await cls.acquire()
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        cls.observe(time.monotonic() - start)
+        cls.release()
+
+
+def stats() -> dict[str, dict]:
+    return {
+        name: {
+            "active": c.active,
+            "limit": c.limit,
+            "queued": len(c.waiters),
+            "avg_service_s": round(c.avg_service, 3),
+        }
+        for name, c in _classes.items()
+    }
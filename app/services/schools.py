@@ -1,25 +1,71 @@
 """NCES EDGE: schools near a point (lat/lon)."""
+import contextlib
 import json
 from urllib.parse import quote
 
-import httpx
+from app.config import NCES_SCHOOLS_URL
+from app.services import cache
+from app.services.http import get_client
+from app.services.json_stream import iter_json_array
+from app.services.records import SchoolRecord
 
-MAPSERVER_BASE = "https://nces.ed.gov/opengis/rest/services/K12_School_Locations/EDGE_GEOCODE_PUBLICSCH_1920/MapServer/0"
+MAPSERVER_BASE = NCES_SCHOOLS_URL
 OUT_FIELDS = "NAME,NCESSCH,STREET,CITY,STATE,ZIP,LAT,LON,LEAID"
 TIMEOUT = 20.0
+CACHE_TTL = 7 * 24 * 3600
 
 
-async def get_schools_near_point(lon: float, lat: float, radius_km: float = 5.0) -> list[dict]:
+async def get_schools_near_point(
+    lon: float,
+    lat: float,
+    radius_km: float = 5.0,
+    refresh_within: float = 0.0,
+) -> list[SchoolRecord]:
     """
-    Return list of school dicts: name, lat, lon, street, city, state, zip, nces_id, lea_id.
-    Uses bounding box for reliability.
+    Return list of SchoolRecord (name, lat, lon, street, city, state, zip, nces_id, lea_id).
+    Uses bounding box for reliability. Results are cached for CACHE_TTL per location at the
+    largest radius fetched so far; a smaller radius is answered by filtering that box locally.
     """
     delta = radius_km / 111.0  # rough degrees for km
+    loc = f"{lat:.4f},{lon:.4f}"
+    widest = cache.get_cached("schools_by_point", loc, refresh_within)
+    if widest is not None and widest["radius_km"] == radius_km:
+        return widest["schools"]
+    if widest is not None and widest["radius_km"] > radius_km:
+        return [
+            s for s in widest["schools"]
+            if s.lat is not None and s.lon is not None
+            and abs(s.lat - lat) <= delta and abs(s.lon - lon) <= delta
+        ]
+    out = await get_schools_in_bbox(
+        lon - delta, lat - delta, lon + delta, lat + delta, refresh_within=refresh_within
+    )
+    if out:
+        cache.set_cached("schools_by_point", loc, {"radius_km": radius_km, "schools": out}, CACHE_TTL)
+    return out
+
+
+async def get_schools_in_bbox(
+    xmin: float,
+    ymin: float,
+    xmax: float,
+    ymax: float,
+    refresh_within: float = 0.0,
+) -> list[SchoolRecord]:
+    """
+    Schools inside a lon/lat envelope (same records as get_schools_near_point). Cached for CACHE_TTL;
+    an expired result is revalidated with a conditional request when the upstream sent validators.
+    """
+    key = f"{xmin:.4f},{ymin:.4f},{xmax:.4f},{ymax:.4f}"
+    cached = cache.get_cached("schools", key, refresh_within)
+    if cached is not None:
+        return cached
+    stale, validators = cache.get_stale("schools", key) or (None, {})
     geometry = json.dumps({
-        "xmin": lon - delta,
-        "ymin": lat - delta,
-        "xmax": lon + delta,
-        "ymax": lat + delta,
+        "xmin": xmin,
+        "ymin": ymin,
+        "xmax": xmax,
+        "ymax": ymax,
     })
     url = (
         f"{MAPSERVER_BASE}/query?"
@@ -28,25 +74,30 @@ async def get_schools_near_point(lon: float, lat: float, radius_km: float = 5.0)
         f"&spatialRel=esriSpatialRelIntersects"
         f"&outFields={quote(OUT_FIELDS)}&returnGeometry=false&f=json"
     )
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        resp = await client.get(url)
-        resp.raise_for_status()
-        data = resp.json()
-    features = data.get("features") or []
-    if data.get("error"):
-        return []
     out = []
-    for f in features:
-        att = f.get("attributes") or {}
-        out.append({
-            "name": att.get("NAME") or "",
-            "nces_id": att.get("NCESSCH"),
-            "street": att.get("STREET"),
-            "city": att.get("CITY"),
-            "state": att.get("STATE"),
-            "zip": att.get("ZIP"),
-            "lat": att.get("LAT"),
-            "lon": att.get("LON"),
-            "lea_id": att.get("LEAID"),
-        })
+    headers = cache.conditional_headers(validators) if stale is not None else {}
+    async with get_client().stream("GET", url, headers=headers, timeout=TIMEOUT) as resp:
+        if resp.status_code == 304:
+            cache.extend("schools", key, CACHE_TTL)
+            return stale
+        resp.raise_for_status()
+        validators = cache.validators_from(resp.headers)
+        # Features are decoded one at a time as they arrive; an ArcGIS {"error": ...} body has none
+        features = iter_json_array(resp.aiter_bytes(), "features")
+        async with contextlib.aclosing(features):
+            async for f in features:
+                att = f.get("attributes") or {}
+                out.append(SchoolRecord(
+                    name=att.get("NAME") or "",
+                    nces_id=att.get("NCESSCH"),
+                    street=att.get("STREET"),
+                    city=att.get("CITY"),
+                    state=att.get("STATE"),
+                    zip=att.get("ZIP"),
+                    lat=att.get("LAT"),
+                    lon=att.get("LON"),
+                    lea_id=att.get("LEAID"),
+                ))
+    if out:
+        cache.set_cached("schools", key, out, CACHE_TTL, validators)
     return out
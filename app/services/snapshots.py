@@ -0,0 +1,217 @@
+"""Materialized profile snapshots for a known listing inventory.
+
+Profiles are stored as precompressed JSON in a content-addressed store (objects named by the
+SHA-256 of their bytes) with an index from normalized address to object, version and per-section
+fetch times. Build or refresh from a file with one address per line:
+
+    python -m app.services.snapshots build listings.txt [--force]
+
+Rebuilds only re-fetch sections whose SECTION_TTLS have lapsed, so a nightly run is cheap.
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.config import DATA_DIR, SNAPSHOT_CONCURRENCY
+from app.schemas.profile import PropertyProfileResponse
+from app.services.aggregator import PROFILE_SECTIONS, build_property_profile, rebuild_profile_sections
+from app.services.scheduler import BATCH, set_priority
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = DATA_DIR / "snapshots"
+OBJECTS_DIR = SNAPSHOT_DIR / "objects"
+INDEX_PATH = SNAPSHOT_DIR / "index.json"
+SNAPSHOT_RADIUS_KM = 2.0  # snapshots are built (and served) for the default radius only
+INDEX_RELOAD_INTERVAL = 30.0
+GZIP_LEVEL = 9  # compressed once at build time, served many times
+
+SECTION_TTLS = {
+    "location": 90 * 24 * 3600,
+    "schools": 30 * 24 * 3600,
+    "property": 7 * 24 * 3600,
+    "nearby_places": 7 * 24 * 3600,
+    "local_news": 20 * 3600,  # nightly rebuilds always refresh news
+}
+
+# Serving-side view of the index: reloaded when the builder rewrites it
+_index: dict[str, dict] = {}
+_index_mtime = 0.0
+_index_checked = 0.0
+
+
+def address_key(address: str) -> str:
+    return " ".join((address or "").lower().split())
+
+
+def _object_path(digest: str) -> Path:
+    return OBJECTS_DIR / digest[:2] / f"{digest}.json.gz"
+
+
+def _read_index() -> dict[str, dict]:
+    try:
+        with open(INDEX_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_index(index: dict[str, dict]) -> None:
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = INDEX_PATH.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp, INDEX_PATH)
+
+
+def _store_object(payload: bytes) -> str:
+    """Write gzip(payload) under its content hash (no-op if already stored). Returns the hash."""
+    digest = hashlib.sha256(payload).hexdigest()
+    path = _object_path(digest)
+    if not path.is_file():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(gzip.compress(payload, GZIP_LEVEL, mtime=0))
+        os.replace(tmp, path)
+    return digest
+
+
+def lookup(address: str, radius_km: float) -> Optional[dict]:
+    """
+    Snapshot for address at radius_km, or None. Returns {"path", "hash", "version", "age"}.
+    The index is re-read when the builder has replaced it (checked every INDEX_RELOAD_INTERVAL).
+    """
+    global _index, _index_mtime, _index_checked
+    if radius_km != SNAPSHOT_RADIUS_KM:
+        return None
+    now = time.time()
+    if now - _index_checked >= INDEX_RELOAD_INTERVAL:
+        _index_checked = now
+        try:
+            mtime = INDEX_PATH.stat().st_mtime
+        except OSError:
+            mtime = 0.0
+        if mtime != _index_mtime:
+            _index, _index_mtime = _read_index(), mtime
+    entry = _index.get(address_key(address))
+    if entry is None:
+        return None
+    path = _object_path(entry["hash"])
+    if not path.is_file():
+        return None
+    return {
+        "path": path,
+        "hash": entry["hash"],
+        "version": entry["version"],
+        "age": int(now - entry["built_at"]),
+    }
+
+
+def _lapsed_sections(entry: dict, now: float) -> set[str]:
+    fetched = entry.get("sections") or {}
+    return {s for s in PROFILE_SECTIONS if now - fetched.get(s, 0) >= SECTION_TTLS[s]}
+
+
+async def _build_one(address: str, index: dict[str, dict], force: bool) -> str:
+    key = address_key(address)
+    entry = index.get(key)
+    now = time.time()
+    sections = set(PROFILE_SECTIONS) if force or entry is None else _lapsed_sections(entry, now)
+    if not sections:
+        return "fresh"
+
+    profile = None
+    if entry is not None and sections != set(PROFILE_SECTIONS):
+        try:
+            previous = json.loads(gzip.decompress(_object_path(entry["hash"]).read_bytes()))
+            profile = await rebuild_profile_sections(
+                PropertyProfileResponse.model_validate(previous), address, sections
+            )
+        except (OSError, ValueError) as e:
+            logger.info("Snapshot for %s unreadable (%s); rebuilding fully", address, e)
+            sections = set(PROFILE_SECTIONS)
+    if profile is None:
+        profile = await build_property_profile(address, radius_km=SNAPSHOT_RADIUS_KM)
+    if profile is None:
+        return "not_found"
+
+    payload = profile.model_dump_json().encode()
+    digest = await asyncio.to_thread(_store_object, payload)
+    fetched = dict((entry or {}).get("sections") or {})
+    fetched.update({s: now for s in sections})
+    changed = entry is None or entry["hash"] != digest
+    new_entry = {
+        "hash": digest,
+        "version": (entry or {}).get("version", 0) + (1 if changed else 0),
+        "built_at": now,
+        "sections": fetched,
+        "address": address,
+    }
+    index[key] = new_entry
+    canonical = address_key(profile.location.normalized_address)
+    if canonical != key:
+        index[canonical] = new_entry  # also serve requests that use the canonical address
+    return "built" if entry is None else ("updated" if changed else "unchanged")
+
+
+def _collect_garbage(index: dict[str, dict]) -> int:
+    live = {e["hash"] for e in index.values()}
+    removed = 0
+    for path in OBJECTS_DIR.glob("*/*.json.gz"):
+        if path.name[: -len(".json.gz")] not in live:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+async def build_snapshots(
+    addresses: list[str],
+    concurrency: int = SNAPSHOT_CONCURRENCY,
+    force: bool = False,
+) -> dict[str, int]:
+    """Build or refresh snapshots for addresses with bounded concurrency (batch priority). Returns counts per outcome."""
+    set_priority(BATCH)
+    index = await asyncio.to_thread(_read_index)
+    sem = asyncio.Semaphore(max(1, concurrency))
+    counts: dict[str, int] = {}
+
+    async def _run(address: str) -> None:
+        async with sem:
+            try:
+                outcome = await _build_one(address, index, force)
+            except Exception as e:
+                logger.warning("Snapshot build failed for %s: %s", address, e)
+                outcome = "failed"
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+    await asyncio.gather(*(_run(a) for a in addresses))
+    await asyncio.to_thread(_write_index, index)
+    counts["objects_removed"] = await asyncio.to_thread(_collect_garbage, index)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build property profile snapshots for a listing inventory.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Build or refresh snapshots (only lapsed sections are re-fetched).")
+    build.add_argument("file", help="Text file with one address per line")
+    build.add_argument("--concurrency", type=int, default=SNAPSHOT_CONCURRENCY)
+    build.add_argument("--force", action="store_true", help="Re-fetch every section")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with open(args.file) as f:
+        addresses = list(dict.fromkeys(line.strip() for line in f if line.strip() and not line.startswith("#")))
+    counts = asyncio.run(build_snapshots(addresses, concurrency=args.concurrency, force=args.force))
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
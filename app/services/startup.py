@@ -0,0 +1,46 @@
+"""Cold-start work kept off the import path: pre-connect upstreams and preload heavy modules in the background."""
+import asyncio
+import importlib
+import logging
+import time
+
+from app.config import PREWARM_UPSTREAMS
+from app.services import http
+from app.services.address_index import index as address_index
+
+logger = logging.getLogger(__name__)
+
+# Imported lazily by the services that use them; loaded here in a thread so the first request rarely pays for it
+HEAVY_MODULES = ("numpy",)
+
+_ready = False
+_started_at = time.monotonic()
+_ready_after_s = None
+
+
+def _preload() -> None:
+    for name in HEAVY_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logger.warning("Preload of %s failed: %s", name, e)
+    address_index.ensure_loaded()
+
+
+async def _connect() -> None:
+    await http.open_client()
+    if PREWARM_UPSTREAMS:
+        await http.preconnect_all()
+
+
+async def run() -> None:
+    """Open (and, if PREWARM_UPSTREAMS, pre-connect) the upstream client while preloading modules/indexes; then mark ready."""
+    global _ready, _ready_after_s
+    await asyncio.gather(asyncio.to_thread(_preload), _connect())
+    _ready = True
+    _ready_after_s = round(time.monotonic() - _started_at, 3)
+    logger.info("Ready after %.3fs", _ready_after_s)
+
+
+def readiness() -> dict:
+    return {"ready": _ready, "ready_after_s": _ready_after_s, "upstreams": http.upstream_status()}
@@ -0,0 +1,187 @@
+"""Request-scoped tracing: span timings, head/tail sampling, OTLP-compatible JSON export."""
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator, Optional, TypeVar
+
+from app.config import TRACE_EXPORT_PATH, TRACE_OTLP_ENDPOINT, TRACE_SAMPLE_RATE, TRACE_SLOW_MS
+from app.services.http import get_client
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "property-profile-api"
+EXPORT_TIMEOUT = 5.0
+
+T = TypeVar("T")
+
+_pending_exports: set[asyncio.Task] = set()
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: dict[str, Any]):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+
+class Trace:
+    """All spans of one request. `sampled` is the head decision; slow traces are exported regardless."""
+
+    def __init__(self, sampled: bool):
+        self.trace_id = os.urandom(16).hex()
+        self.sampled = sampled
+        self.spans: list[Span] = []
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextlib.contextmanager
+def start_trace(name: str, force_sample: bool = False, **attributes: Any) -> Iterator[Trace]:
+    """Open a trace with a root span for the current request (context-local)."""
+    trace = Trace(sampled=force_sample or random.random() < TRACE_SAMPLE_RATE)
+    trace_token = _current_trace.set(trace)
+    try:
+        with span(name, **attributes):
+            yield trace
+    finally:
+        _current_trace.reset(trace_token)
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time a block as a child of the current span. No-op outside a trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _current_span.get()
+    s = Span(name, parent.span_id if parent else None, attributes)
+    trace.spans.append(s)
+    token = _current_span.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+
+async def traced(name: str, awaitable: Awaitable[T], **attributes: Any) -> T:
+    """Await inside a span; wrap each asyncio.gather branch with this."""
+    with span(name, **attributes):
+        return await awaitable
+
+
+def span_tree(trace: Trace) -> Optional[dict[str, Any]]:
+    """Nested {name, duration_ms, attributes, children} view of the trace, for inline debugging."""
+    nodes = {
+        s.span_id: {
+            "name": s.name,
+            "start_offset_ms": 0.0,
+            "duration_ms": round(s.duration_ms, 3),
+            "attributes": s.attributes,
+            "error": s.error,
+            "children": [],
+        }
+        for s in trace.spans
+    }
+    root = None
+    root_start = trace.spans[0].start_ns if trace.spans else 0
+    for s in trace.spans:
+        node = nodes[s.span_id]
+        node["start_offset_ms"] = round((s.start_ns - root_start) / 1e6, 3)
+        if s.parent_id and s.parent_id in nodes:
+            nodes[s.parent_id]["children"].append(node)
+        elif root is None:
+            root = node
+    if root is not None:
+        root["trace_id"] = trace.trace_id
+    return root
+
+
+def _otlp_value(v: Any) -> dict[str, Any]:
+    if isinstance(v, bool):
+        return {"boolValue": v}
+    if isinstance(v, int):
+        return {"intValue": str(v)}
+    if isinstance(v, float):
+        return {"doubleValue": v}
+    return {"stringValue": str(v)}
+
+
+def to_otlp(trace: Trace) -> dict[str, Any]:
+    """OTLP/HTTP JSON (ExportTraceServiceRequest) for one trace."""
+    spans = []
+    for s in trace.spans:
+        item = {
+            "traceId": trace.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 2 if s.parent_id is None else 1,  # SERVER for the root, INTERNAL otherwise
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns or time.time_ns()),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent_id:
+            item["parentSpanId"] = s.parent_id
+        spans.append(item)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+        }]
+    }
+
+
+def _append_line(path: str, line: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(line + "\n")
+
+
+async def _export(payload: dict[str, Any]) -> None:
+    try:
+        if TRACE_OTLP_ENDPOINT:
+            resp = await get_client().post(TRACE_OTLP_ENDPOINT, json=payload, timeout=EXPORT_TIMEOUT)
+            resp.raise_for_status()
+        else:
+            await asyncio.to_thread(_append_line, TRACE_EXPORT_PATH, json.dumps(payload))
+    except Exception as e:
+        logger.debug("Trace export failed: %s", e)
+
+
+def finish_trace(trace: Trace, error: bool = False) -> None:
+    """Export the trace if head-sampled, slow (tail sampler) or failed. Export runs in the background."""
+    if not trace.spans:
+        return
+    slow = trace.spans[0].duration_ms >= TRACE_SLOW_MS
+    if not (trace.sampled or slow or error):
+        return
+    task = asyncio.get_running_loop().create_task(_export(to_otlp(trace)))
+    _pending_exports.add(task)
+    task.add_done_callback(_pending_exports.discard)
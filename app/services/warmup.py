@@ -0,0 +1,96 @@
+"""Predictive cache warming: pre-fetch the hottest addresses/areas at startup and refresh them before expiry."""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.config import WARMUP_TOP_K
+from app.services.address_index import index as address_index
+from app.services.aggregator import _city_state_from_address
+from app.services.hot_keys import tracker
+from app.services.geocode import geocode_address_with_geographies
+from app.services.schools import get_schools_near_point
+from app.services.nearby_poi import MAX_AREA_PLACES, get_nearby_poi
+from app.services.local_news import get_local_news
+from app.services.ratelimit import RateLimiter
+from app.services.scheduler import BATCH, Overloaded, admission
+
+logger = logging.getLogger(__name__)
+
+CONCURRENCY = 2  # warm-up never holds more than this many upstream fetches
+MIN_INTERVAL = 0.5  # seconds between warm-up starts, so live traffic keeps the upstream budget
+REFRESH_INTERVAL = 300.0  # how often popular keys are checked for upcoming expiry
+REFRESH_MARGIN = 900.0  # refresh entries expiring within this many seconds
+SAVE_INTERVAL = 300.0
+DECAY_INTERVAL = 24 * 3600.0
+DEFAULT_RADIUS_KM = 2.0
+
+
+def _split_area(area: str) -> tuple[Optional[str], Optional[str]]:
+    city, _, state = area.partition(",")
+    return city.strip() or None, state.strip() or None
+
+
+async def warm_address(address: str, refresh_within: float = 0.0) -> None:
+    """Fill (or refresh) geocode, schools, POI and news caches for one address."""
+    geo = await geocode_address_with_geographies(address, refresh_within=refresh_within)
+    if not geo:
+        return
+    lat, lon = geo["lat"], geo["lon"]
+    city, state = _city_state_from_address(geo.get("matched_address") or address)
+    await asyncio.gather(
+        get_schools_near_point(lon, lat, radius_km=5.0, refresh_within=refresh_within),
+        get_nearby_poi(
+            lat, lon, radius_km=DEFAULT_RADIUS_KM, refresh_within=refresh_within, limit=MAX_AREA_PLACES
+        ),
+        get_local_news(city=city, state=state, refresh_within=refresh_within),
+        return_exceptions=True,
+    )
+
+
+async def warm_area(area: str, refresh_within: float = 0.0) -> None:
+    city, state = _split_area(area)
+    await get_local_news(city=city, state=state, refresh_within=refresh_within)
+
+
+async def warm_top_keys(refresh_within: float = 0.0, top_k: int = WARMUP_TOP_K) -> int:
+    """Warm the top_k addresses and areas under the rate limit. Returns the number of keys processed."""
+    limiter = RateLimiter(MIN_INTERVAL)
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    async def _run(coro_fn, key: str) -> None:
+        await limiter.wait()
+        async with sem:
+            try:
+                async with admission(BATCH):
+                    await coro_fn(key, refresh_within=refresh_within)
+            except Overloaded:
+                logger.debug("Warm-up skipped for %s: batch queue full", key)
+            except Exception as e:
+                logger.debug("Warm-up failed for %s: %s", key, e)
+
+    jobs = [_run(warm_address, k) for k, _ in tracker.top("address", top_k)]
+    jobs += [_run(warm_area, k) for k, _ in tracker.top("area", top_k)]
+    await asyncio.gather(*jobs)
+    return len(jobs)
+
+
+async def run_warmup() -> None:
+    """Background loop: initial warm-up, then periodic pre-expiry refresh."""
+    n = await warm_top_keys()
+    logger.info("Cache warm-up done for %d hot keys", n)
+    while True:
+        await asyncio.sleep(REFRESH_INTERVAL)
+        await warm_top_keys(refresh_within=REFRESH_MARGIN)
+
+
+async def run_persistence() -> None:
+    """Background loop (independent of warm-up): save hot keys and new addresses, decay hot-key counts."""
+    last_decay = time.monotonic()
+    while True:
+        await asyncio.sleep(SAVE_INTERVAL)
+        if time.monotonic() - last_decay >= DECAY_INTERVAL:
+            tracker.decay()
+            last_decay = time.monotonic()
+        await asyncio.to_thread(tracker.save)
+        await asyncio.to_thread(address_index.save)
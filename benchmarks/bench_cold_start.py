@@ -0,0 +1,172 @@
+"""Cold-start benchmark: time from process spawn to the first successful property profile.
+
+Starts local stand-in upstreams, one server (origin) each for the Census geocoder, NCES schools and
+Overpass (RentCast and NewsCatcher stay disabled as no keys are set), then for each mode spawns a fresh `uvicorn app.main:app` pointed
+at them with an empty DATA_DIR. Each new upstream connection is delayed by --connect-delay-ms to
+stand in for DNS + TCP + TLS setup. Reports, per mode, the median time from spawn until /health
+answers, until /ready reports ready, and until the first GET /api/property-profile (sent once /ready
+does, as a load balancer would) returns 200, plus that first request's own latency.
+
+    python benchmarks/bench_cold_start.py [--runs 5] [--connect-delay-ms 150]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote
+from urllib.request import urlopen
+
+ROOT = Path(__file__).resolve().parent.parent
+LAT, LON = 37.3349, -121.8881
+ADDRESS = "1 Washington Sq, San Jose, CA 95192"
+
+GEOCODE = {"result": {"addressMatches": [{
+    "matchedAddress": "1 WASHINGTON SQ, SAN JOSE, CA, 95192",
+    "coordinates": {"x": LON, "y": LAT},
+    "geographies": {"Census Tracts": [{"GEOID": "06085500100"}]},
+}]}}
+SCHOOLS = {"features": [
+    {"attributes": {"NAME": f"School {i}", "NCESSCH": f"06{i:010d}", "STREET": "1 School Rd", "CITY": "San Jose",
+                    "STATE": "CA", "ZIP": "95112", "LEAID": "0634590",
+                    "LAT": LAT + 0.001 * (i % 20 - 10), "LON": LON + 0.001 * (i // 20 - 2)}}
+    for i in range(60)
+]}
+OVERPASS = {"elements": [
+    {"type": "node", "id": i, "lat": LAT + 0.0005 * (i % 40 - 20), "lon": LON + 0.0005 * (i // 40 - 10),
+     "tags": {"amenity": ("cafe", "restaurant", "gym")[i % 3], "name": f"Place {i}"}}
+    for i in range(800)
+]}
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Canned upstream responses over keep-alive HTTP/1.1; connection setup costs connect_delay seconds."""
+    protocol_version = "HTTP/1.1"
+    connect_delay = 0.0
+
+    def setup(self):
+        time.sleep(self.connect_delay)
+        super().setup()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b"") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._send(200)
+
+    def do_GET(self):
+        if self.path.startswith("/geocoder/geographies/onelineaddress"):
+            self._send(200, json.dumps(GEOCODE).encode())
+        elif self.path.startswith("/nces/query"):
+            self._send(200, json.dumps(SCHOOLS).encode())
+        else:
+            self._send(404, b"{}")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path.startswith("/overpass"):
+            self._send(200, json.dumps(OVERPASS).encode())
+        else:
+            self._send(404, b"{}")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(url: str) -> int:
+    try:
+        with urlopen(url, timeout=30) as resp:
+            resp.read()
+            return resp.status
+    except HTTPError as e:
+        return e.code
+    except (URLError, ConnectionError):
+        return 0
+
+
+def _wait_for(url: str, start: float, deadline: float = 60.0) -> float:
+    while time.perf_counter() - start < deadline:
+        if _get(url) == 200:
+            return time.perf_counter() - start
+        time.sleep(0.005)
+    raise TimeoutError(url)
+
+
+def run_once(upstreams: dict[str, str], prewarm: bool) -> dict[str, float]:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = {
+            **os.environ,
+            "DATA_DIR": data_dir,
+            "WARMUP_ENABLED": "0",
+            "PREWARM_UPSTREAMS": "1" if prewarm else "0",
+            "RENTCAST_API_KEY": "",
+            "NEWSCATCHER_API_KEY": "",
+            "UNSPLASH_ACCESS_KEY": "",
+            "TRACE_SAMPLE_RATE": "0",
+            "CENSUS_GEOCODER_URL": f"{upstreams['census']}/geocoder",
+            "NCES_SCHOOLS_URL": f"{upstreams['nces']}/nces",
+            "OVERPASS_URLS": f"{upstreams['overpass']}/overpass",
+        }
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            health = _wait_for(f"{base}/health", start)
+            ready = _wait_for(f"{base}/ready", start)
+            status = _get(f"{base}/api/property-profile?address={quote(ADDRESS)}")
+            if status != 200:
+                raise RuntimeError(f"profile returned {status}")
+            profile = time.perf_counter() - start
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+    return {"health": health, "ready": ready, "profile": profile, "request": profile - ready}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--connect-delay-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    StandIn.connect_delay = args.connect_delay_ms / 1000
+    servers = {name: ThreadingHTTPServer(("127.0.0.1", 0), StandIn) for name in ("census", "nces", "overpass")}
+    for server in servers.values():
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    upstreams = {name: f"http://127.0.0.1:{server.server_address[1]}" for name, server in servers.items()}
+    try:
+        for name, prewarm in (("PREWARM_UPSTREAMS=0", False), ("PREWARM_UPSTREAMS=1", True)):
+            runs = [run_once(upstreams, prewarm) for _ in range(args.runs)]
+            med = {k: statistics.median(r[k] for r in runs) * 1000 for k in runs[0]}
+            print(f"{name:20s} /health {med['health']:6.0f} ms   /ready {med['ready']:6.0f} ms   "
+                  f"first profile {med['profile']:6.0f} ms (request {med['request']:5.0f} ms)")
+    finally:
+        for server in servers.values():
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Micro-benchmark: plain dicts + per-item models vs slotted records converted at the edge.
+
+Simulates one area fetch (2000 Overpass elements, 300 NCES features): each item is converted to
+its internal form, then everything goes into a PropertyProfileResponse and is serialized. Reports
+the best time for the whole pass and for the edge stage alone (internal lists -> serialized
+response), and the memory held by the internal lists.
+
+    python benchmarks/bench_records.py [--places 2000] [--schools 300] [--repeat 50]
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.schemas.profile import Location, MapData, MapSchool, NearbyPlace, PropertyProfileResponse, School  # noqa: E402
+from app.services.aggregator import _map_schools  # noqa: E402
+from app.services.nearby_poi import _element_to_place  # noqa: E402
+from app.services.records import SchoolRecord  # noqa: E402
+
+
+def _elements(n: int) -> list[dict]:
+    rnd = random.Random(1)
+    return [
+        {
+            "type": "node",
+            "lat": 37.3 + rnd.uniform(-0.02, 0.02),
+            "lon": -121.9 + rnd.uniform(-0.02, 0.02),
+            "tags": {"amenity": rnd.choice(["cafe", "restaurant", "gym"]), "name": f"Place {i}",
+                     "addr:street": "Main St", "addr:housenumber": str(i)},
+        }
+        for i in range(n)
+    ]
+
+
+def _features(n: int) -> list[dict]:
+    rnd = random.Random(2)
+    return [
+        {"attributes": {"NAME": f"School {i}", "NCESSCH": f"06{i:010d}", "STREET": "1 School Rd",
+                        "CITY": "San Jose", "STATE": "CA", "ZIP": "95112", "LEAID": "0634590",
+                        "LAT": 37.3 + rnd.uniform(-0.05, 0.05), "LON": -121.9 + rnd.uniform(-0.05, 0.05)}}
+        for i in range(n)
+    ]
+
+
+def _response(map_schools: list, schools: list, places: list) -> PropertyProfileResponse:
+    return PropertyProfileResponse(
+        location=Location(normalized_address="1 MAIN ST", lat=37.3, lon=-121.9),
+        map=MapData(center={"lat": 37.3, "lon": -121.9}, schools=map_schools),
+        schools=schools,
+        property=None,
+        property_message=None,
+        nearby_places=places,
+    )
+
+
+# Previous shape: dict per item, then one model per item built from .get() lookups
+def _place_dict(el: dict) -> dict:
+    tags = el.get("tags") or {}
+    parts = [tags.get("addr:street"), tags.get("addr:housenumber"), tags.get("addr:city"),
+             tags.get("addr:state"), tags.get("addr:postcode")]
+    return {
+        "name": tags.get("name") or tags.get("brand") or "Unnamed",
+        "lat": el.get("lat"),
+        "lon": el.get("lon"),
+        "category": tags.get("amenity") or tags.get("shop") or "place",
+        "address": " ".join(str(p) for p in parts if p) or None,
+    }
+
+
+def _school_dict(f: dict) -> dict:
+    att = f["attributes"]
+    return {"name": att.get("NAME") or "", "nces_id": att.get("NCESSCH"), "street": att.get("STREET"),
+            "city": att.get("CITY"), "state": att.get("STATE"), "zip": att.get("ZIP"),
+            "lat": att.get("LAT"), "lon": att.get("LON"), "lea_id": att.get("LEAID")}
+
+
+def dict_build(elements: list[dict], features: list[dict]):
+    return [_place_dict(el) for el in elements], [_school_dict(f) for f in features]
+
+
+def dict_edge(places: list[dict], schools: list[dict]) -> PropertyProfileResponse:
+    response = _response(
+        [MapSchool(name=s["name"], lat=s.get("lat") or 0, lon=s.get("lon") or 0, street=s.get("street"),
+                   city=s.get("city"), state=s.get("state"), zip=s.get("zip")) for s in schools],
+        [School(name=s["name"], nces_id=s.get("nces_id"), street=s.get("street"), city=s.get("city"),
+                state=s.get("state"), zip=s.get("zip"), lat=s.get("lat"), lon=s.get("lon")) for s in schools],
+        [NearbyPlace(name=p["name"], lat=p["lat"], lon=p["lon"], category=p["category"],
+                     address=p.get("address")) for p in places],
+    )
+    response.model_dump_json()
+    return response
+
+
+def record_build(elements: list[dict], features: list[dict]):
+    places = [_element_to_place(el) for el in elements]
+    schools = []
+    for f in features:
+        att = f["attributes"]
+        schools.append(SchoolRecord(
+            name=att.get("NAME") or "", nces_id=att.get("NCESSCH"), street=att.get("STREET"),
+            city=att.get("CITY"), state=att.get("STATE"), zip=att.get("ZIP"),
+            lat=att.get("LAT"), lon=att.get("LON"), lea_id=att.get("LEAID"),
+        ))
+    return places, schools
+
+
+def record_edge(places: list, schools: list) -> PropertyProfileResponse:
+    response = _response(_map_schools(schools), schools, places)
+    response.model_dump_json()
+    return response
+
+
+def _time(fn, repeat: int, *args) -> float:
+    """Best of repeat runs with the cyclic GC paused (as timeit does)."""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(*args)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def _retained(build, *args) -> int:
+    """Bytes allocated for the internal lists of one fetch."""
+    tracemalloc.start()
+    lists = build(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del lists
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--places", type=int, default=2000)
+    parser.add_argument("--schools", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    elements, features = _elements(args.places), _features(args.schools)
+    pipelines = (
+        ("dicts + per-item models", dict_build, dict_edge),
+        ("records, converted at edge", record_build, record_edge),
+    )
+    for name, build, edge in pipelines:
+        total = _time(lambda: edge(*build(elements, features)), args.repeat)
+        lists = build(elements, features)
+        edge_only = _time(edge, args.repeat, *lists)
+        kib = _retained(build, elements, features) / 1024
+        print(f"{name:28s} {total * 1000:7.2f} ms/pass   edge {edge_only * 1000:6.2f} ms   internal lists {kib:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
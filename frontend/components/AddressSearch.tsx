@@ -1,8 +1,10 @@
 "use client";
 
-import { useState, useCallback } from "react";
-import type { PropertyProfileResponse } from "@/lib/types";
-import { fetchPropertyProfile } from "@/lib/api";
+import { useState, useCallback, useEffect, useId } from "react";
+import type { AddressSuggestion, PropertyProfileResponse } from "@/lib/types";
+import { fetchAddressSuggestions, fetchPropertyProfile } from "@/lib/api";
+
+const SUGGEST_DEBOUNCE_MS = 120;
 
 type AddressSearchProps = {
   onResult: (profile: PropertyProfileResponse) => void;
@@ -23,6 +25,19 @@ export function AddressSearch({
 }: AddressSearchProps) {
   const [value, setValue] = useState(defaultValue);
   const [isLoading, setIsLoading] = useState(false);
+  const [suggestions, setSuggestions] = useState<AddressSuggestion[]>([]);
+  const listId = useId();
+
+  useEffect(() => {
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      setSuggestions(await fetchAddressSuggestions(value, controller.signal));
+    }, SUGGEST_DEBOUNCE_MS);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [value]);
 
   const handleSubmit = useCallback(
     async (e: React.FormEvent) => {
@@ -62,7 +77,14 @@ export function AddressSearch({
           isCompact ? "px-3 py-2 text-sm" : "px-4 py-3.5 text-base"
         }`}
         aria-label="Address"
+        list={listId}
+        autoComplete="off"
       />
+      <datalist id={listId}>
+        {suggestions.map((s) => (
+          <option key={s.address} value={s.address} />
+        ))}
+      </datalist>
       <button
         type="submit"
         disabled={loading || !value.trim()}
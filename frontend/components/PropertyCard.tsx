@@ -1,5 +1,7 @@
 "use client";
 
+import { apiUrl } from "@/lib/api";
+
 type PropertyCardProps = {
   property: Record<string, unknown> | null;
   propertyMessage: string | null;
@@ -57,7 +59,7 @@ export function PropertyCard({ property, propertyMessage, images }: PropertyCard
       {firstImage?.url && (
         <div className="mb-3">
           <img
-            src={firstImage.url}
+            src={apiUrl(firstImage.url)}
             alt=""
             className="w-full h-40 object-cover rounded-lg border border-slate-200"
           />
@@ -1,7 +1,12 @@
-import type { PropertyProfileResponse } from "./types";
+import type { AddressSuggestion, NearbyResponse, PropertyProfileResponse } from "./types";
 
 const API_BASE = process.env.NEXT_PUBLIC_API_URL ?? "http://127.0.0.1:8000";
 
+/** Resolve backend-relative URLs (e.g. /api/images/...) against the API base. */
+export function apiUrl(path: string): string {
+  return path.startsWith("/") ? `${API_BASE}${path}` : path;
+}
+
 export async function fetchPropertyProfile(
   address: string,
   radiusKm?: number
@@ -20,3 +25,31 @@ export async function fetchPropertyProfile(
   }
   return res.json() as Promise<PropertyProfileResponse>;
 }
+
+/** Canonical addresses starting with the typed text (empty on short input or any error). */
+export async function fetchAddressSuggestions(
+  query: string,
+  signal?: AbortSignal
+): Promise<AddressSuggestion[]> {
+  const q = query.trim();
+  if (q.length < 3) return [];
+  try {
+    const url = `${API_BASE}/api/address-suggest?${new URLSearchParams({ q, limit: "8" }).toString()}`;
+    const res = await fetch(url, { signal });
+    if (!res.ok) return [];
+    const data = (await res.json()) as { suggestions: AddressSuggestion[] };
+    return data.suggestions ?? [];
+  } catch {
+    return [];
+  }
+}
+
+/** Nearby places and neighbourhood stats for a new radius, without refetching the whole profile. */
+export async function fetchNearby(lat: number, lon: number, radiusKm: number): Promise<NearbyResponse> {
+  const params = { lat: String(lat), lon: String(lon), radius_km: String(radiusKm) };
+  const res = await fetch(`${API_BASE}/api/nearby?${new URLSearchParams(params).toString()}`);
+  if (!res.ok) {
+    throw new Error("FETCH_FAILED");
+  }
+  return res.json() as Promise<NearbyResponse>;
+}
@@ -30,6 +30,7 @@ export interface School {
   zip?: string | null;
   lat?: number | null;
   lon?: number | null;
+  lea_id?: string | null;
 }
 
 export interface NearbyPlace {
@@ -47,6 +48,44 @@ export interface NewsItem {
   published_date?: string | null;
 }
 
+export interface RingStats {
+  radius_km: number;
+  counts?: Record<string, number> | null;
+  schools: number;
+}
+
+export interface NeighborhoodStats {
+  geohash: string;
+  poi_radius_km: number;
+  rings: RingStats[];
+  nearest_km: Record<string, number>;
+  amenity_score: number;
+  complete?: boolean;
+}
+
+export interface Demographics {
+  geoid: string;
+  level: "block_group" | "tract";
+  vintage?: string | null;
+  population?: number | null;
+  median_age?: number | null;
+  median_household_income?: number | null;
+  median_home_value?: number | null;
+  median_gross_rent?: number | null;
+  owner_occupied_units?: number | null;
+  renter_occupied_units?: number | null;
+}
+
+export interface AssignedDistrict {
+  lea_id: string;
+  name: string;
+  state_fips?: string | null;
+  grades?: string | null;
+  school_count: number;
+  schools: School[];
+  schools_source: "district" | "nearby";
+}
+
 export interface PropertyProfileResponse {
   location: Location;
   map: MapData;
@@ -58,4 +97,40 @@ export interface PropertyProfileResponse {
   nearby_places?: NearbyPlace[];
   radius_km?: number | null;
   local_news?: NewsItem[] | null;
+  neighborhood_stats?: NeighborhoodStats | null;
+  demographics?: Demographics | null;
+  assigned_district?: AssignedDistrict | null;
+  nearby_places_truncated?: boolean;
+}
+
+export interface NearbyResponse {
+  lat: number;
+  lon: number;
+  radius_km: number;
+  nearby_places: NearbyPlace[];
+  nearby_places_truncated: boolean;
+  neighborhood_stats?: NeighborhoodStats | null;
+}
+
+export interface AddressSuggestion {
+  address: string;
+  popularity: number;
+}
+
+export interface ComparisonSummary {
+  address: string;
+  normalized_address: string;
+  school_count: number;
+  nearest_school_km?: number | null;
+  place_count: number;
+  places_by_category: Record<string, number>;
+  nearest_place_km: Record<string, number>;
+  has_property_data: boolean;
+}
+
+export interface PropertyComparisonResponse {
+  radius_km: number;
+  profiles: PropertyProfileResponse[];
+  summaries: ComparisonSummary[];
+  not_found: string[];
 }
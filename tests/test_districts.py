@@ -0,0 +1,50 @@
+"""Point-in-polygon over NaN-separated rings (app/services/districts.py)."""
+import numpy as np
+import pytest
+
+from app.services.districts import _contains, _rings
+
+
+def _coords(geometry: dict) -> np.ndarray:
+    """Rings concatenated with NaN separator rows, as the ingest stores them."""
+    sep = np.full((1, 2), np.nan)
+    return np.concatenate([x for r in _rings(geometry) for x in (np.asarray(r, dtype=np.float64), sep)])
+
+
+def _square(x0: float, y0: float, x1: float, y1: float) -> list:
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+
+
+SQUARE = {"type": "Polygon", "coordinates": [_square(0, 0, 10, 10)]}
+WITH_HOLE = {"type": "Polygon", "coordinates": [_square(0, 0, 10, 10), _square(4, 4, 6, 6)]}
+TWO_ISLANDS = {"type": "MultiPolygon", "coordinates": [[_square(0, 0, 2, 2)], [_square(5, 5, 7, 7)]]}
+
+
+@pytest.mark.parametrize("geometry, lon, lat, expected", [
+    (SQUARE, 5, 5, True),
+    (SQUARE, 11, 5, False),
+    (SQUARE, 5, -1, False),
+    (WITH_HOLE, 2, 2, True),
+    (WITH_HOLE, 5, 5, False),  # inside the hole
+    (WITH_HOLE, 5, 7, True),  # same longitude as the hole, outside it
+    (TWO_ISLANDS, 1, 1, True),
+    (TWO_ISLANDS, 6, 6, True),
+    (TWO_ISLANDS, 3.5, 3.5, False),  # between the islands, inside their joint bbox
+    (TWO_ISLANDS, 6, 1, False),
+])
+def test_contains(geometry, lon, lat, expected):
+    assert _contains(_coords(geometry), lat, lon) is expected
+
+
+def test_concave_ring():
+    # U shape: the notch between the arms is outside
+    u = [[0, 0], [6, 0], [6, 6], [4, 6], [4, 2], [2, 2], [2, 6], [0, 6], [0, 0]]
+    coords = _coords({"type": "Polygon", "coordinates": [u]})
+    assert _contains(coords, lat=4, lon=1)  # left arm
+    assert _contains(coords, lat=1, lon=5)  # base
+    assert not _contains(coords, lat=4, lon=3)
+
+
+def test_unknown_geometry_has_no_rings():
+    assert _rings({"type": "Point", "coordinates": [0, 0]}) == []
+    assert _rings(None) == []
@@ -0,0 +1,26 @@
+"""Geohash encode/decode (app/services/geo_utils.py)."""
+import pytest
+
+from app.services.geo_utils import geohash_center, geohash_encode
+
+
+@pytest.mark.parametrize("lat, lon, precision, expected", [
+    (42.6, -5.6, 5, "ezs42"),
+    (57.64911, 10.40744, 11, "u4pruydqqvj"),
+    (37.3349, -121.8881, 7, "9q9k6"),
+])
+def test_encode_known_cells(lat, lon, precision, expected):
+    assert geohash_encode(lat, lon, precision).startswith(expected)
+
+
+@pytest.mark.parametrize("lat, lon", [(37.3349, -121.8881), (-33.8688, 151.2093), (0.0, 0.0), (89.9, 179.9)])
+def test_center_round_trips(lat, lon):
+    cell = geohash_encode(lat, lon, 7)
+    center_lat, center_lon = geohash_center(cell)
+    # Precision 7 cells are ~0.0014 deg tall and wide; the centre re-encodes to the same cell
+    assert abs(center_lat - lat) < 0.001 and abs(center_lon - lon) < 0.001
+    assert geohash_encode(center_lat, center_lon, 7) == cell
+
+
+def test_prefix_is_parent_cell():
+    assert geohash_encode(37.3349, -121.8881, 9).startswith(geohash_encode(37.3349, -121.8881, 6))
@@ -0,0 +1,54 @@
+"""Count-min sketch and top-k tracking (app/services/hot_keys.py)."""
+from app.services.hot_keys import CountMinSketch, HotKeyTracker
+
+
+def test_sketch_never_undercounts():
+    sketch = CountMinSketch(width=64, depth=4)
+    counts = {f"key{i}": i % 7 + 1 for i in range(300)}  # far more keys than columns: collisions
+    for key, n in counts.items():
+        sketch.add(key, n)
+    assert all(sketch.estimate(key) >= n for key, n in counts.items())
+
+
+def test_sketch_exact_without_collisions():
+    sketch = CountMinSketch()
+    assert sketch.add("a") == 1
+    assert sketch.add("a", 4) == 5
+    assert sketch.estimate("a") == 5
+    assert sketch.estimate("never seen") == 0
+
+
+def test_halve():
+    sketch = CountMinSketch()
+    sketch.add("a", 9)
+    sketch.halve()
+    assert sketch.estimate("a") == 4
+
+
+def test_top_k_evicts_coldest():
+    tracker = HotKeyTracker(top_k=3, path=None)
+    for key, n in (("a", 5), ("b", 1), ("c", 3)):
+        tracker.record("address", key, n)
+    tracker.record("address", "d", 4)  # evicts the coldest ("b")
+    tracker.record("area", "x", 10)  # kinds share the slots: evicts "c"
+    assert tracker.top("address") == [("a", 5), ("d", 4)]
+    assert tracker.top("area") == [("x", 10)]
+
+
+def test_keys_are_normalized():
+    tracker = HotKeyTracker(path=None)
+    tracker.record("address", "1 Main  St")
+    tracker.record("address", "1 main st")
+    assert tracker.estimate("address", "1 MAIN ST") == 2
+
+
+def test_save_load_round_trip(tmp_path):
+    path = tmp_path / "hot_keys.json"
+    tracker = HotKeyTracker(path=path)
+    tracker.record("address", "1 main st", 3)
+    tracker.record("area", "san jose, ca")
+    tracker.save()
+    restored = HotKeyTracker(path=path)
+    restored.load()
+    assert restored.top("address") == [("1 main st", 3)]
+    assert restored.estimate("area", "San Jose, CA") == 1
@@ -0,0 +1,55 @@
+"""Incremental JSON array parsing (app/services/json_stream.py)."""
+import asyncio
+import json
+
+import pytest
+
+from app.services.json_stream import iter_json_array
+
+
+async def _chunks(body: bytes, size: int):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+def _collect(body: bytes, key: str, size: int, trailer=None) -> list:
+    async def run():
+        return [item async for item in iter_json_array(_chunks(body, size), key, trailer)]
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 10_000])
+def test_items_across_chunk_boundaries(size):
+    data = {
+        "version": 0.6,
+        "osm3s": {"copyright": 'a "quoted" \\ ] } [ {'},
+        "elements": [{"id": i, "tags": {"name": f"P{i} ]}}", "n": [1, {"x": "["}]}} for i in range(20)],
+    }
+    assert _collect(json.dumps(data).encode(), "elements", size) == data["elements"]
+
+
+def test_nested_key_with_same_name_is_ignored():
+    body = json.dumps({"meta": {"elements": [{"wrong": 1}]}, "elements": [{"right": 1}]}).encode()
+    assert _collect(body, "elements", 5) == [{"right": 1}]
+
+
+@pytest.mark.parametrize("size", [1, 4, 1000])
+def test_trailer_after_array_is_read(size):
+    body = (
+        b'{"version": 0.6, "elements": [{"id": 1}, {"id": 2}],\n'
+        b'"remark": "runtime error: Query timed out in \\"query\\" at line 3 after 26 seconds."}'
+    )
+    trailer = {}
+    assert _collect(body, "elements", size, trailer) == [{"id": 1}, {"id": 2}]
+    assert trailer["remark"].startswith("runtime error: Query timed out")
+
+
+def test_trailer_empty_when_array_is_last():
+    trailer = {}
+    assert _collect(b'{"elements": [] }', "elements", 2, trailer) == []
+    assert trailer == {}
+
+
+def test_scalar_items_rejected():
+    with pytest.raises(ValueError):
+        _collect(b'{"elements": [1, 2]}', "elements", 4)
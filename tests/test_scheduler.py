@@ -0,0 +1,63 @@
+"""Admission control (app/services/scheduler.py)."""
+import asyncio
+
+import pytest
+
+from app.services.scheduler import BATCH, INTERACTIVE, Overloaded, _PriorityClass, current_priority, set_priority
+
+
+def test_slot_is_handed_to_the_next_waiter():
+    async def run():
+        cls = _PriorityClass("t", limit=1, budget=10)
+        cls.avg_service = 1.0
+        await cls.acquire()
+        waiter = asyncio.create_task(cls.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done() and len(cls.waiters) == 1
+        cls.release()
+        await waiter
+        assert cls.active == 1 and not cls.waiters
+        cls.release()
+        assert cls.active == 0
+    asyncio.run(run())
+
+
+def test_sheds_when_expected_wait_exceeds_budget():
+    async def run():
+        cls = _PriorityClass("t", limit=1, budget=3)
+        cls.avg_service = 2.0
+        await cls.acquire()
+        first = asyncio.create_task(cls.acquire())  # expected wait 2 s: queued
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as exc:
+            await cls.acquire()  # expected wait 4 s: shed
+        assert exc.value.priority == "t" and exc.value.retry_after == 4
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert not cls.waiters
+    asyncio.run(run())
+
+
+def test_waiter_gives_up_after_budget():
+    async def run():
+        cls = _PriorityClass("t", limit=1, budget=0.05)
+        cls.avg_service = 0.01
+        await cls.acquire()
+        with pytest.raises(Overloaded):
+            await cls.acquire()
+        assert not cls.waiters and cls.active == 1
+    asyncio.run(run())
+
+
+def test_priority_is_per_context():
+    async def batch_task():
+        set_priority(BATCH)
+        return current_priority()
+
+    async def run():
+        assert await asyncio.create_task(batch_task()) == BATCH
+        assert current_priority() == INTERACTIVE
+        set_priority("unknown")
+        assert current_priority() == INTERACTIVE
+    asyncio.run(run())